@@ -0,0 +1,118 @@
+# coding=utf-8
+"""
+详情页JSON解析基准测试
+对比原来的先解码再解析、直接从bytes解析、JSON_BACKEND解析和列表模式解析每页的耗时
+
+用法:
+    python bench_json.py --capture http://api.ffzyapi.com/api.php/provide/vod/ --pages 5 --out pages
+    python bench_json.py pages/*.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import types
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+try:
+    import base.spider
+except ImportError:
+    # 不在TVBox环境中运行时提供最小的Spider基类，基准测试只用到JSON解析
+    class _Spider:
+        def __init__(self):
+            pass
+
+        def log(self, msg):
+            print(msg)
+
+    sys.modules["base"] = types.ModuleType("base")
+    sys.modules["base.spider"] = types.ModuleType("base.spider")
+    sys.modules["base.spider"].Spider = _Spider
+from vod_base import VodSpider
+
+
+def capture(api_url, pages, out_dir):
+    """
+    下载ac=detail的列表页保存到本地，作为基准测试的输入
+
+    Args:
+        api_url (str): 站点API接口地址
+        pages (int): 下载的页数
+        out_dir (str): 保存目录
+
+    Returns:
+        list: 保存的文件路径列表
+    """
+    import requests
+
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for pg in range(1, pages + 1):
+        response = requests.get(api_url, params={"ac": "detail", "pg": str(pg)},
+                                headers=VodSpider.DEFAULT_HEADERS, timeout=15)
+        response.raise_for_status()
+        path = os.path.join(out_dir, f"detail_{pg}.json")
+        with open(path, 'wb') as f:
+            f.write(response.content)
+        paths.append(path)
+    return paths
+
+
+def measure(fn, content, rounds):
+    """
+    重复解析同一页，返回每次解析的平均耗时
+
+    Args:
+        fn (callable): 解析函数
+        content (bytes): 响应体
+        rounds (int): 重复次数
+
+    Returns:
+        float: 平均耗时（毫秒）
+    """
+    fn(content)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn(content)
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="详情页JSON解析基准测试")
+    parser.add_argument("files", nargs="*", help="保存的ac=detail响应文件")
+    parser.add_argument("--capture", metavar="API_URL", help="先从该接口下载详情页")
+    parser.add_argument("--pages", type=int, default=5, help="下载的页数")
+    parser.add_argument("--out", default="pages", help="下载保存的目录")
+    parser.add_argument("--rounds", type=int, default=50, help="每页重复解析的次数")
+    args = parser.parse_args()
+
+    files = list(args.files)
+    if args.capture:
+        files.extend(capture(args.capture, args.pages, args.out))
+    if not files:
+        parser.error("需要指定响应文件或--capture")
+
+    spider = VodSpider()
+    backend = "orjson" if spider._json_decoder() is not json.loads else "json"
+    modes = [
+        ("text", lambda content: json.loads(content.decode('utf-8', 'replace'))),
+        ("bytes", json.loads),
+        (backend, spider._json_loads),
+        ("list", lambda content: spider._json_loads(
+            spider._skip_json_fields(content, spider.LIST_SKIP_FIELDS))),
+    ]
+
+    print("页面\t大小(KB)\t" + "\t".join(f"{name}(ms)" for name, _ in modes))
+    totals = [0.0] * len(modes)
+    for path in files:
+        with open(path, 'rb') as f:
+            content = f.read()
+        timings = [measure(fn, content, args.rounds) for _, fn in modes]
+        totals = [total + timing for total, timing in zip(totals, timings)]
+        print(f"{os.path.basename(path)}\t{len(content) / 1024:.0f}\t" +
+              "\t".join(f"{timing:.2f}" for timing in timings))
+    print("平均\t\t" + "\t".join(f"{total / len(files):.2f}" for total in totals))
+
+
+if __name__ == '__main__':
+    main()
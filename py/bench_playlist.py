@@ -0,0 +1,211 @@
+# coding=utf-8
+"""
+播放列表广告过滤基准测试
+用合成的长播放列表对比原来逐行判断是否落在广告区间内的过滤方式和现在一次解析、按区间切片输出的过滤方式
+
+用法:
+    python bench_playlist.py
+    python bench_playlist.py --segments 10000 --discontinuities 40 --rounds 5
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import types
+from urllib import parse
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+try:
+    import base.spider
+except ImportError:
+    # 没有TVBox的base包时补一个最小的Spider基类，过滤广告只用到log
+    class _Spider:
+        def __init__(self):
+            pass
+
+        def log(self, msg):
+            print(msg)
+
+    sys.modules["base"] = types.ModuleType("base")
+    sys.modules["base.spider"] = types.ModuleType("base.spider")
+    sys.modules["base.spider"].Spider = _Spider
+from vod_base import VodSpider
+
+URL = "https://cdn.example.com/20240101/abc/1000kb/hls/index.m3u8"
+
+
+def synthesize(segments, discontinuities, signature, seed=0):
+    """
+    生成合成的媒体播放列表，每个不连续点后插入一段与广告特征时长一致的分片
+
+    Args:
+        segments (int): 正片分片数量
+        discontinuities (int): 不连续点数量
+        signature (list): 插入的广告分片时长
+        seed (int): 随机种子
+
+    Returns:
+        bytes: M3U8内容
+    """
+    rng = random.Random(seed)
+    positions = set(rng.sample(range(1, segments), discontinuities))
+    lines = ["#EXTM3U", "#EXT-X-VERSION:3", "#EXT-X-TARGETDURATION:6"]
+    for i in range(segments):
+        if i in positions:
+            lines.append("#EXT-X-DISCONTINUITY")
+            for j, duration in enumerate(signature):
+                lines.append(f"#EXTINF:{duration},")
+                lines.append(f"ad{i}_{j}.ts")
+            lines.append("#EXT-X-DISCONTINUITY")
+        lines.append(f"#EXTINF:{rng.choice([4, 4, 5.32, 3.72, 2.0])},")
+        lines.append(rng.choice([f"seg{i}.ts", f"/abs/seg{i}.ts", f"http://x/seg{i}.ts"]))
+    lines.append("#EXT-X-ENDLIST")
+    return "\n".join(lines).encode("utf-8")
+
+
+def absolute_lines(url, lines):
+    """
+    原来的实现:逐行补全.ts地址
+
+    Args:
+        url (str): 原始M3U8 URL
+        lines (list): M3U8内容行列表
+
+    Returns:
+        list: 补全地址后的行列表
+    """
+    result_lines = []
+    for line in lines:
+        line = line.strip()
+        if '.ts' in line:
+            if line.startswith('http'):
+                result_lines.append(line)
+            elif line.startswith('/'):
+                parsed_url = parse.urlparse(url)
+                result_lines.append(f"{parsed_url.scheme}://{parsed_url.netloc}" + line)
+            else:
+                result_lines.append(url.rsplit('/', maxsplit=1)[0] + '/' + line)
+        else:
+            result_lines.append(line)
+    return result_lines
+
+
+def baseline_discontinuity(url, lines):
+    """
+    原来的模式1:逐行检查是否落在任一过滤区间内
+
+    Args:
+        url (str): 原始M3U8 URL
+        lines (list): M3U8内容行列表
+
+    Returns:
+        str: 过滤后的内容
+    """
+    result_lines = absolute_lines(url, lines)
+    indices = [i for i, line in enumerate(result_lines) if line == '#EXT-X-DISCONTINUITY']
+    filter_ranges = []
+    if len(indices) >= 1:
+        filter_ranges.append((indices[0], indices[0]))
+    if len(indices) >= 3:
+        filter_ranges.append((indices[1], indices[2]))
+    if len(indices) >= 5:
+        filter_ranges.append((indices[3], indices[4]))
+    return '\n'.join(line for i, line in enumerate(result_lines)
+                     if not any(start <= i <= end for start, end in filter_ranges))
+
+
+def baseline_duration(url, lines, presets, tolerance):
+    """
+    原来的模式2:每个EXTINF行用正则提取时长，逐行检查是否落在任一广告区间内
+    原来的误差默认为0且比较不含等号，永远匹配不到广告，这里使用和现在相同的误差以便比较删除广告的开销
+
+    Args:
+        url (str): 原始M3U8 URL
+        lines (list): M3U8内容行列表
+        presets (list): 广告时长特征
+        tolerance (float): 每个分片允许的时长误差（秒）
+
+    Returns:
+        str: 过滤后的内容
+    """
+    result_lines = absolute_lines(url, lines)
+
+    sequences = []
+    current = []
+    for i, line in enumerate(result_lines):
+        if line.startswith('#EXTINF:'):
+            match = re.search(r'#EXTINF:([\d.]+)', line)
+            current.append(float(match.group(1)) if match else 0)
+        elif line == '#EXT-X-DISCONTINUITY' and current:
+            sequences.append((current, i - len(current) * 2, i - 1))
+            current = []
+    if current:
+        sequences.append((current, len(result_lines) - len(current) * 2, len(result_lines) - 1))
+
+    ad_ranges = []
+    for durations, start, end in sequences:
+        for preset in presets:
+            if len(durations) == len(preset) and all(
+                    abs(d - p) <= tolerance for d, p in zip(durations, preset)):
+                ad_ranges.append((start, end))
+                break
+
+    return '\n'.join(line for i, line in enumerate(result_lines)
+                     if not any(start <= i <= end for start, end in ad_ranges))
+
+
+def measure(fn, rounds):
+    """
+    重复执行过滤，返回每次的最短耗时
+
+    Args:
+        fn (callable): 过滤函数
+        rounds (int): 重复次数
+
+    Returns:
+        tuple: (最短耗时（毫秒）, 最后一次的输出)
+    """
+    best = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        output = fn()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="播放列表广告过滤基准测试")
+    parser.add_argument("--segments", type=int, default=10000, help="正片分片数量")
+    parser.add_argument("--discontinuities", type=int, default=40, help="插入的广告段数量")
+    parser.add_argument("--rounds", type=int, default=5, help="每种方式重复的次数")
+    args = parser.parse_args()
+
+    spider = VodSpider()
+    presets = VodSpider.AD_SIGNATURES[""]
+    data = synthesize(args.segments, args.discontinuities, presets[0])
+    index = spider._ad_signature_index(parse.urlparse(URL).hostname)
+    tolerance = spider.AD_SIGNATURE_TOLERANCE
+
+    # 修改前后都包含从响应内容到过滤结果的全部步骤
+    modes = [
+        ("模式1",
+         lambda: baseline_discontinuity(URL, data.decode("utf-8").splitlines()),
+         lambda: spider._filter_ads_by_discontinuity_original(spider._parse_playlist(data, URL))),
+        ("模式2",
+         lambda: baseline_duration(URL, data.decode("utf-8").splitlines(), presets, tolerance),
+         lambda: spider._filter_ads_by_duration(spider._parse_playlist(data, URL), index)),
+    ]
+
+    print(f"{args.segments}个分片，{args.discontinuities}段广告，{len(data) / 1024:.0f}KB")
+    print("模式\t修改前(ms)\t修改后(ms)\t加速\t剩余分片(修改前/修改后)")
+    for name, before, after in modes:
+        before_ms, before_output = measure(before, args.rounds)
+        after_ms, after_output = measure(after, args.rounds)
+        print(f"{name}\t{before_ms:.1f}\t{after_ms:.1f}\t{before_ms / after_ms:.1f}x\t"
+              f"{before_output.count('#EXTINF')}/{after_output.count(b'#EXTINF')}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,4183 @@
+# coding=utf-8
+"""
+通用资源站爬虫引擎
+各资源站爬虫继承VodSpider并只声明站点配置，所有站点共用同一份实现
+"""
+from base.spider import Spider as BaseSpider
+import contextvars
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+from collections import OrderedDict, deque
+sys.path.append('..')
+
+
+class RetryPolicy:
+    """
+    接口请求的重试策略
+    区分可以重试的错误，按带抖动的指数退避等待，并限制单次界面调用的总耗时
+    """
+
+    # 可以重试的HTTP状态码
+    RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+    def __init__(self, max_attempts=3, base_delay=0.25, max_delay=2.0, budget=15):
+        """
+        Args:
+            max_attempts (int): 最大尝试次数
+            base_delay (float): 首次重试的退避上限（秒），之后每次翻倍
+            max_delay (float): 退避上限（秒）
+            budget (float): 单次界面调用内所有请求和等待的总时间预算（秒）
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+
+    def retryable(self, status=None, error=None):
+        """
+        判断请求失败是否值得重试
+
+        Args:
+            status (int): HTTP状态码
+            error (Exception): 请求异常
+
+        Returns:
+            bool: 网络错误、超时和服务端临时错误返回True，404、数据格式错误等返回False
+        """
+        if error is not None:
+            import asyncio
+            import requests
+            errors = (requests.ConnectionError, requests.Timeout,
+                      requests.exceptions.ChunkedEncodingError, asyncio.TimeoutError)
+            try:
+                import aiohttp
+                errors += (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+            except ImportError:
+                pass
+            return isinstance(error, errors)
+        return status in self.RETRYABLE_STATUS
+
+    def delay(self, attempt):
+        """
+        计算第attempt次失败后的等待时间，在0到指数退避上限之间随机取值，避免多个请求同时重试
+
+        Args:
+            attempt (int): 已失败的次数减一
+
+        Returns:
+            float: 等待时间（秒）
+        """
+        import random
+
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class VodSpider(BaseSpider):
+    """
+    通用爬虫资源站实现
+    该类提供了一个通用的爬虫模板，适用于具有标准API接口的视频资源站
+    继承类只需覆盖下方的站点配置类属性
+    """
+
+    # 爬虫名称
+    SPIDER_NAME = ""
+    # AJAX接口URL模板，用于直接获取分类数据
+    AJAX_API_URL = ""
+    # API接口地址
+    API_URL = ""
+    # API接口镜像地址，与API_URL一起按延迟和错误率选择
+    API_MIRRORS = ()
+    # AJAX接口镜像地址
+    AJAX_API_MIRRORS = ()
+    # 需要排除的分类ID集合
+    EXCLUDE_CATEGORIES = frozenset()
+    # 图片基础URL，用于处理相对路径的图片链接
+    IMAGE_BASE_URL = "https://img.picbf.com"
+    # 需要过滤的播放源关键词列表
+    FILTER_KEYWORDS = ()
+    # 默认请求头
+    DEFAULT_HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36"}
+    # 是否在日志中打印模式2检测到的广告区间内容
+    LOG_AD_RANGES = False
+    # 模式2的广告时长特征，键为CDN主机名后缀，空字符串表示所有主机，值为各广告片段的分片时长列表
+    AD_SIGNATURES = {
+        "": [
+            [4, 4, 4, 5.32, 3.72],
+            [4, 4, 4, 5.32, 3.88, 1.72],
+            [4, 4, 4, 5.32, 3.88, 2.76],
+            [4, 4, 4, 4, 3.08],
+        ]
+    }
+
+    # 站点注册表文件，默认为仓库根目录的api.json
+    SITE_REGISTRY_PATH = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), '..', 'api.json')
+    # 注册表站点字段与站点配置类属性的对应关系
+    SITE_CONFIG_FIELDS = {
+        "name": "SPIDER_NAME",
+        "api": "API_URL",
+        "ajax": "AJAX_API_URL",
+        "apiMirrors": "API_MIRRORS",
+        "ajaxMirrors": "AJAX_API_MIRRORS",
+        "exclude": "EXCLUDE_CATEGORIES",
+        "filterKeywords": "FILTER_KEYWORDS",
+        "imageBase": "IMAGE_BASE_URL",
+        "adSignatures": "AD_SIGNATURES",
+    }
+    # 已加载的站点注册表，键为文件路径或URL，值为(修改时间, {key: 站点配置}, 编译后的播放列表规则)，
+    # 修改时间为None表示读取失败，由_site_lock保护
+    _site_registry = {}
+    # 按需创建的站点爬虫，键为站点key
+    _site_spiders = {}
+    _site_lock = threading.Lock()
+    # 聚合搜索各站点的耗时统计，键为站点名称，由_shared_lock保护
+    _search_metrics = {}
+
+    # 共享线程池最大线程数，所有爬虫实例共用同一个线程池
+    SHARED_POOL_MAX_WORKERS = 8
+    # 每个主机同时进行的最大请求数
+    HOST_MAX_CONCURRENCY = 4
+    # 共享线程池、各主机的并发信号量及统计信息，由_shared_lock保护
+    _shared_executor = None
+    _shared_lock = threading.Lock()
+    _host_semaphores = {}
+    _host_metrics = {}
+    _pool_metrics = {"queued": 0, "running": 0,
+                     "completed": 0, "max_queued": 0}
+    # 各主机的熔断状态，由_shared_lock保护
+    _host_breakers = {}
+    # 各主机的滑动平均延迟和错误率，用于在镜像间选择，由_shared_lock保护
+    _endpoint_health = {}
+    # 当前界面调用的截止时间，各线程和协程独立，提交到共享线程池和事件循环的任务继承提交方的截止时间
+    _call_deadline_var = contextvars.ContextVar("vod_call_deadline", default=None)
+    # 所有爬虫实例共用的asyncio事件循环，运行在单独的线程中，由_shared_lock保护
+    _async_loop = None
+    # 事件循环中使用的aiohttp会话，安装了aiohttp时创建，只在事件循环线程中访问
+    _async_session = None
+    # orjson的解析函数，首次解析时检测，未安装时为False
+    _orjson_loads = None
+    # 列表请求跳过的字段对应的预编译正则，键为字段元组
+    _json_skip_patterns = {}
+    # M3U8解析用的预编译正则:不连续点行、EXTINF时长、相对于根路径和相对于当前路径的.ts行
+    _DISCONTINUITY_PATTERN = re.compile(
+        rb'^[ \t]*#EXT-X-DISCONTINUITY[ \t]*\r?$', re.M)
+    _EXTINF_PATTERN = re.compile(rb'^[ \t]*#EXTINF:[ \t]*([\d.]*)', re.M)
+    _ROOT_SEGMENT_PATTERN = re.compile(rb'^(?=/[^\r\n]*\.ts)', re.M)
+    _RELATIVE_SEGMENT_PATTERN = re.compile(
+        rb'^(?![#/\r\n]|http)(?=[^\r\n]*\.ts)', re.M)
+    # 补全后的分片地址行，分片代理模式下改写为本地代理地址
+    _ABSOLUTE_SEGMENT_PATTERN = re.compile(
+        rb'^https?://[^\r\n]*\.ts[^\r\n]*?(?=\r?$)', re.M)
+    # GB2312一级汉字按拼音排序，各声母首字的编码，用于计算拼音首字母
+    _PINYIN_INITIAL_BOUNDARIES = (
+        0xB0A1, 0xB0C5, 0xB2C1, 0xB4EE, 0xB6EA, 0xB7A2, 0xB8C1, 0xB9FE,
+        0xBBF7, 0xBFA6, 0xC0AC, 0xC2E8, 0xC4C3, 0xC5B6, 0xC5BE, 0xC6DA,
+        0xC8BB, 0xC8F6, 0xCBFA, 0xCDDA, 0xCEF4, 0xD1B9, 0xD4D1, 0xD7FA)
+    _PINYIN_INITIALS = "abcdefghjklmnopqrstwxyz"
+    # 单个字符到拼音首字母的缓存，无法确定首字母的字符对应空串
+    _pinyin_initial_cache = {}
+
+    def __init__(self):
+        super().__init__()
+        # 排除分类ID的整数集合，由EXCLUDE_CATEGORIES预先构建，所有列表过滤共用
+        self._excluded_type_ids = self._build_excluded_type_ids()
+        # 本地缓存目录，用于保存片名索引等需要跨进程重启保留的数据
+        self.CACHE_DIR = os.path.join(tempfile.gettempdir(), "vod_spider")
+        # 片名索引最多收录的视频数量，超过时淘汰最早收录的视频
+        self.TITLE_INDEX_MAX_DOCS = 50000
+        # 快速搜索从片名索引返回的最大结果数
+        self.TITLE_INDEX_QUICK_LIMIT = 30
+        # 待加入片名索引的视频达到该数量时在后台建立索引
+        self.TITLE_INDEX_FLUSH_BATCH = 500
+        # 片名索引写入磁盘的最小间隔（秒）
+        self.TITLE_INDEX_SAVE_INTERVAL = 60
+        # 片名索引:视频ID到[片名, 图片, 备注, 规范化片名, 拼音首字母]，按收录顺序排列
+        self._title_docs = OrderedDict()
+        # 片名索引的倒排表，键为规范化片名和拼音首字母的相邻两字
+        self._title_postings = {}
+        # 待加入片名索引的视频，由_build_video_object追加，检索前统一处理
+        self._title_pending = []
+        # 是否已提交后台建立索引的任务，任务开始处理待加入的视频时清除
+        self._title_flush_scheduled = False
+        self._title_index_loaded = False
+        self._title_index_dirty = False
+        self._title_index_saved_at = 0
+        self._title_index_lock = threading.Lock()
+        # 正在后台刷新的快速搜索关键词
+        self._quick_refreshing = set()
+        # 是否启用本地片库同步，启用后定期拉取最近更新的视频存入SQLite，首页、分类和详情优先使用本地数据
+        self.CATALOG_SYNC_ENABLED = False
+        # 本地片库同步间隔（秒）
+        self.CATALOG_SYNC_INTERVAL = 1800
+        # 首次同步拉取最近多少小时内更新的视频
+        self.CATALOG_SYNC_INITIAL_HOURS = 72
+        # 单次同步最多拉取的页数
+        self.CATALOG_SYNC_MAX_PAGES = 100
+        # 本地片库连接及后台同步线程的停止标记
+        self._catalog = None
+        self._catalog_lock = threading.Lock()
+        self._catalog_stop = None
+        # 分类缓存，避免重复请求:初始化
+        self.CATEGORY_CACHE = None
+        self._category_cached_at = 0
+        # 分类缓存有效期（秒），过期后先返回旧数据再在后台刷新
+        self.CATEGORY_CACHE_TTL = 6 * 3600
+        # 首页推荐视频缓存及有效期（秒），过期后先返回旧数据再在后台刷新
+        self._home_videos = None
+        self._home_cached_at = 0
+        self.HOME_CACHE_TTL = 600
+        # 正在后台刷新的缓存名称
+        self._revalidating = set()
+        self._revalidate_lock = threading.Lock()
+        # HTTP连接池大小，每个主机保持的长连接数量
+        self.POOL_SIZE = 4
+        # 连接池空闲超时时间（秒），超时后重建会话，避免复用已被服务端关闭的连接
+        self.POOL_IDLE_TIMEOUT = 60
+        # 共享HTTP会话，首次请求时创建
+        self._session = None
+        self._session_last_used = 0
+        self._session_lock = threading.Lock()
+        # 响应缓存最大条目数
+        self.RESPONSE_CACHE_MAX_ENTRIES = 200
+        # 响应缓存最大字节数（按原始响应体大小估算）
+        self.RESPONSE_CACHE_MAX_BYTES = 8 * 1024 * 1024
+        # 响应缓存有效期（秒）:detail为按ID查询详情，first_page为第一页列表，default为其他请求
+        self.RESPONSE_CACHE_TTL = {"detail": 1800, "first_page": 60, "default": 300}
+        # 响应缓存，LRU顺序，键为请求地址和规范化后的参数
+        self._response_cache = OrderedDict()
+        self._response_cache_bytes = 0
+        self._response_cache_lock = threading.Lock()
+        # JSON解析后端:"auto"在安装了orjson时使用orjson，"json"使用标准库，也可以设置为接受bytes的解析函数
+        self.JSON_BACKEND = "auto"
+        # 列表请求解析前从响应体中去掉的字段，列表界面不显示这些字段，去掉后不再解码这些长字符串
+        self.LIST_SKIP_FIELDS = ("vod_content", "vod_blurb",
+                                 "vod_play_from", "vod_play_server", "vod_play_note", "vod_play_url",
+                                 "vod_down_from", "vod_down_server", "vod_down_note", "vod_down_url")
+        # 接口请求的重试策略:最大尝试次数、退避时间和单次界面调用的时间预算
+        self.RETRY_POLICY = RetryPolicy()
+        # 没有请求记录的镜像按该延迟（秒）参与排序
+        self.ENDPOINT_DEFAULT_LATENCY = 1.0
+        # 镜像延迟和错误率滑动平均的权重，越大越看重最近的请求
+        self.ENDPOINT_HEALTH_ALPHA = 0.3
+        # 主机连续失败多少次后熔断
+        self.BREAKER_FAILURE_THRESHOLD = 5
+        # 熔断后多久放行试探请求（秒）
+        self.BREAKER_RESET_TIMEOUT = 30
+        # 正在进行的接口请求，键为响应缓存键，相同请求共用一次网络请求和解析
+        self._inflight_requests = {}
+        self._inflight_lock = threading.Lock()
+        # 事件循环中正在进行的接口请求，键为响应缓存键，只在事件循环线程中访问
+        self._async_inflight = {}
+        # 安装了aiohttp时是否直接在事件循环中发送接口请求，否则在共享线程池中使用requests发送
+        self.ASYNC_HTTP_ENABLED = True
+        # 分类列表是否同时请求AJAX接口和API接口，关闭时按AJAX优先、API兜底的顺序请求
+        self.PARALLEL_CATEGORY_FETCH = True
+        # 详情请求的合并窗口（秒），窗口内到达的视频ID合并为一次ids请求
+        self.DETAIL_BATCH_WINDOW = 0.02
+        # 单次详情请求最多包含的视频ID数量
+        self.DETAIL_BATCH_MAX = 20
+        # 等待其他请求代为获取详情的最长时间（秒）
+        self.DETAIL_BATCH_TIMEOUT = 30
+        # 正在收集视频ID的详情批次，以及视频ID到所在批次的映射，由_detail_lock保护
+        self._detail_batch = None
+        self._detail_inflight = {}
+        self._detail_lock = threading.Lock()
+        # 聚合搜索的总时限（秒），超时未返回的站点直接放弃
+        self.SEARCH_DEADLINE = 8
+        # 聚合搜索时单个站点的请求超时时间（秒）
+        self.SEARCH_SITE_TIMEOUT = 5
+        # 子分类归并游标的有效期（秒），过期后从第一页重新归并
+        self.SUBCATEGORY_CURSOR_TTL = 300
+        # 最多保留的子分类归并状态数量
+        self.SUBCATEGORY_CURSOR_MAX = 8
+        # 子分类归并状态，键为主分类ID和筛选参数
+        self._subcategory_states = OrderedDict()
+        self._subcategory_states_lock = threading.Lock()
+        # M3U8请求超时时间（秒）:(连接超时, 读取超时)
+        self.PLAYLIST_TIMEOUT = (5, 10)
+        # 主播放列表跳转子播放列表的最大层数
+        self.PLAYLIST_MAX_DEPTH = 3
+        # M3U8播放列表最大字节数，超过时放弃处理
+        self.PLAYLIST_MAX_BYTES = 4 * 1024 * 1024
+        # 正在进行的本地代理请求的取消标记
+        self._proxy_cancel_events = set()
+        self._proxy_lock = threading.Lock()
+        # 最近的本地代理耗时记录
+        self._proxy_timings = deque(maxlen=50)
+        # 已过滤播放列表缓存有效期（秒），过期后使用ETag/Last-Modified重新校验
+        self.PLAYLIST_CACHE_TTL = 600
+        # 已过滤播放列表缓存最大条目数
+        self.PLAYLIST_CACHE_MAX_ENTRIES = 32
+        # 已过滤播放列表缓存最大字节数
+        self.PLAYLIST_CACHE_MAX_BYTES = 16 * 1024 * 1024
+        # 已过滤播放列表缓存，LRU顺序，键为M3U8地址
+        self._playlist_cache = OrderedDict()
+        self._playlist_cache_bytes = 0
+        self._playlist_cache_lock = threading.Lock()
+        # 广告时长特征匹配时每个分片允许的时长误差（秒）
+        self.AD_SIGNATURE_TOLERANCE = 0.05
+        # 按CDN主机编译好的广告时长特征索引，键为(主机名, 误差)
+        self._ad_signature_indexes = {}
+        # 是否通过本地代理转发.ts分片，开启后播放列表中的分片地址改写为本地代理地址，并预取后续分片
+        self.SEGMENT_PROXY_ENABLED = False
+        # 每次请求分片时预取的后续分片数量
+        self.SEGMENT_PREFETCH_COUNT = 3
+        # 分片缓冲区最大字节数，超过时淘汰最早的分片
+        self.SEGMENT_BUFFER_MAX_BYTES = 64 * 1024 * 1024
+        # 单个分片最大字节数，超过时放弃
+        self.SEGMENT_MAX_BYTES = 32 * 1024 * 1024
+        # 记录分片顺序的播放列表数量
+        self.SEGMENT_PLAYLIST_MAX = 4
+        # 分片缓冲区，键为分片地址，值为下载任务的Future，按加入顺序淘汰
+        self._segment_buffer = OrderedDict()
+        # 最近播放列表的分片顺序，以及分片地址到(分片列表, 位置)的映射，用于确定预取哪些分片
+        self._segment_playlists = OrderedDict()
+        self._segment_positions = {}
+        self._segment_lock = threading.Lock()
+        self._segment_executor = None
+        # 一级分类关键字，用于识别主分类
+        self.PRIMARY_CATEGORIES_KEYWORDS = [
+            '影视解说', '电影解说', '电影', '电影片', '电视剧', '连续剧', '综艺', '动漫', '纪录片', '演唱会', '音乐', '体育', '体育赛事', '短剧', '爽文短剧', '短剧大全']
+        # 二级分类映射，定义了主分类下的子分类关键字
+        self.SECONDARY_CATEGORIES_MAP = {
+            '电影': ['动作片', '喜剧片', '爱情片', '科幻片', '恐怖片', '剧情片', '战争片', '动画片', '动画电影', '4K电影', '邵氏电影', 'Netflix电影'],
+            '电影片': ['动作片', '喜剧片', '爱情片', '科幻片', '恐怖片', '剧情片', '战争片', '动画片', '动画电影', '4K电影', '邵氏电影', 'Netflix电影'],
+            '电视剧': ['国产剧', '台剧', '台湾剧', '韩剧', '韩国剧', '欧美剧', '港剧', '香港剧', '泰剧', '泰国剧', '日剧', '日本剧', '海外剧', 'Netflix自制剧'],
+            '连续剧': ['国产剧', '台剧', '台湾剧', '韩剧', '韩国剧', '欧美剧', '港剧', '香港剧', '泰剧', '泰国剧', '日剧', '日本剧', '海外剧', 'Netflix自制剧'],
+            '综艺': ['大陆综艺', '港台综艺', '日韩综艺', '欧美综艺'],
+            '动漫': ['国产动漫', '日韩动漫', '欧美动漫', '港台动漫', '海外动漫'],
+            '体育': ['篮球', '足球', '斯诺克', '网球'],
+            '体育赛事': ['篮球', '足球', '斯诺克', '网球'],
+            '短剧': ['有声动漫', '女频恋爱', '反转爽剧', '古装仙侠', '年代穿越', '脑洞悬疑', '现代都市'],
+            '爽文短剧': ['有声动漫', '女频恋爱', '反转爽剧', '古装仙侠', '年代穿越', '脑洞悬疑', '现代都市'],
+            '短剧大全': ['有声动漫', '女频恋爱', '反转爽剧', '古装仙侠', '年代穿越', '脑洞悬疑', '现代都市']
+        }
+
+    def _get_session(self):
+        """
+        获取共享的HTTP会话，复用长连接以避免每次请求重新进行TCP+TLS握手
+
+        Returns:
+            requests.Session: 挂载了连接池的会话对象
+        """
+        import time
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        with self._session_lock:
+            now = time.time()
+            # 空闲超时后丢弃旧连接池
+            if self._session is not None and now - self._session_last_used > self.POOL_IDLE_TIMEOUT:
+                self._session.close()
+                self._session = None
+
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.POOL_SIZE, pool_maxsize=self.POOL_SIZE)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+
+            self._session_last_used = now
+            return self._session
+
+    def _get_shared_executor(self):
+        """
+        获取所有爬虫实例共用的线程池，首次使用时创建
+
+        Returns:
+            concurrent.futures.ThreadPoolExecutor: 共享线程池
+        """
+        import concurrent.futures
+
+        with VodSpider._shared_lock:
+            if VodSpider._shared_executor is None:
+                VodSpider._shared_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.SHARED_POOL_MAX_WORKERS, thread_name_prefix="spider")
+            return VodSpider._shared_executor
+
+    def _submit_shared(self, fn, *args):
+        """
+        提交任务到共享线程池，并记录排队和执行中的任务数
+
+        Args:
+            fn (callable): 要执行的函数
+            *args: 函数参数
+
+        Returns:
+            concurrent.futures.Future: 任务的Future对象
+        """
+        executor = self._get_shared_executor()
+        deadline = VodSpider._call_deadline_var.get()
+        metrics = VodSpider._pool_metrics
+        with VodSpider._shared_lock:
+            metrics["queued"] += 1
+            metrics["max_queued"] = max(
+                metrics["max_queued"], metrics["queued"])
+
+        def run():
+            with VodSpider._shared_lock:
+                metrics["queued"] -= 1
+                metrics["running"] += 1
+            token = VodSpider._call_deadline_var.set(deadline)
+            try:
+                return fn(*args)
+            finally:
+                VodSpider._call_deadline_var.reset(token)
+                with VodSpider._shared_lock:
+                    metrics["running"] -= 1
+                    metrics["completed"] += 1
+
+        return executor.submit(run)
+
+    def _get_async_loop(self):
+        """
+        获取所有爬虫实例共用的asyncio事件循环，首次使用时在后台线程中启动，进程退出时关闭
+
+        Returns:
+            asyncio.AbstractEventLoop: 共享事件循环
+        """
+        import asyncio
+        import atexit
+
+        with VodSpider._shared_lock:
+            if VodSpider._async_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever,
+                                 name="spider-async", daemon=True).start()
+                VodSpider._async_loop = loop
+                atexit.register(self._shutdown_async_loop)
+            return VodSpider._async_loop
+
+    def _shutdown_async_loop(self):
+        """
+        关闭事件循环中的aiohttp会话并停止共享事件循环
+        """
+        import asyncio
+
+        with VodSpider._shared_lock:
+            loop = VodSpider._async_loop
+            VodSpider._async_loop = None
+        if loop is None:
+            return
+
+        session = VodSpider._async_session
+        VodSpider._async_session = None
+        if session is not None and not session.closed:
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    session.close(), loop).result(1)
+            except Exception:
+                pass
+        loop.call_soon_threadsafe(loop.stop)
+
+    def _submit_async(self, coro):
+        """
+        提交协程到共享事件循环，协程继承提交方的截止时间
+
+        Args:
+            coro (coroutine): 要执行的协程
+
+        Returns:
+            concurrent.futures.Future: 协程的Future对象，取消时同时取消协程
+        """
+        import asyncio
+
+        deadline = VodSpider._call_deadline_var.get()
+
+        async def run():
+            VodSpider._call_deadline_var.set(deadline)
+            return await coro
+
+        return asyncio.run_coroutine_threadsafe(run(), self._get_async_loop())
+
+    def _run_async(self, coro):
+        """
+        在共享事件循环中执行协程并等待结果，供同步的Spider接口调用，不能在事件循环线程中调用
+
+        Args:
+            coro (coroutine): 要执行的协程
+
+        Returns:
+            协程的返回值
+        """
+        if threading.current_thread().name == "spider-async":
+            coro.close()
+            raise RuntimeError("不能在事件循环线程中同步等待协程")
+        return self._submit_async(coro).result()
+
+    async def _to_thread(self, fn, *args):
+        """
+        在共享线程池中执行阻塞函数并等待结果，不阻塞事件循环
+
+        Args:
+            fn (callable): 要执行的函数
+            *args: 函数参数
+
+        Returns:
+            fn的返回值
+        """
+        import asyncio
+
+        return await asyncio.wrap_future(self._submit_shared(fn, *args))
+
+    def _get_async_session(self):
+        """
+        获取事件循环中使用的aiohttp会话，每个主机的连接数不超过HOST_MAX_CONCURRENCY
+
+        Returns:
+            aiohttp.ClientSession or None: 未安装aiohttp或未启用时返回None
+        """
+        if not self.ASYNC_HTTP_ENABLED:
+            return None
+        try:
+            import aiohttp
+        except ImportError:
+            return None
+
+        if VodSpider._async_session is None or VodSpider._async_session.closed:
+            VodSpider._async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit_per_host=self.HOST_MAX_CONCURRENCY, keepalive_timeout=self.POOL_IDLE_TIMEOUT),
+                trust_env=True)
+        return VodSpider._async_session
+
+    async def _async_get(self, url, params, timeout):
+        """
+        在事件循环中发送GET请求，安装了aiohttp时直接异步请求，否则在共享线程池中使用requests请求
+
+        Args:
+            url (str): 请求地址
+            params (dict): 请求参数
+            timeout (float): 请求超时时间（秒）
+
+        Returns:
+            tuple: (status_code, content) 状态码和原始响应体
+        """
+        session = self._get_async_session()
+        if session is None:
+            response = await self._to_thread(
+                self._session_get, url, params, self.DEFAULT_HEADERS, timeout)
+            return response.status_code, response.content
+
+        import aiohttp
+
+        async with session.get(
+                url, params={key: str(value) for key, value in params.items()},
+                headers=self.DEFAULT_HEADERS, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            return response.status, await response.read()
+
+    def _host_slot(self, url):
+        """
+        获取请求地址所属主机的并发信号量
+
+        Args:
+            url (str): 请求地址
+
+        Returns:
+            tuple: (host, semaphore) 主机名和对应的信号量
+        """
+        from urllib import parse
+
+        host = parse.urlparse(url).netloc
+        with VodSpider._shared_lock:
+            semaphore = VodSpider._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(
+                    self.HOST_MAX_CONCURRENCY)
+                VodSpider._host_semaphores[host] = semaphore
+                VodSpider._host_metrics[host] = {"waiting": 0, "active": 0}
+            return host, semaphore
+
+    def _pool_stats(self):
+        """
+        获取共享线程池和各主机的并发统计
+
+        Returns:
+            dict: 包含线程池排队数、执行数、完成数，各主机等待数和执行数，以及各主机的熔断状态、延迟和错误率
+        """
+        with VodSpider._shared_lock:
+            return {
+                "pool": dict(VodSpider._pool_metrics),
+                "hosts": {host: dict(metrics) for host, metrics in VodSpider._host_metrics.items()},
+                "breakers": {host: dict(breaker) for host, breaker in VodSpider._host_breakers.items()},
+                "endpoints": {host: dict(health) for host, health in VodSpider._endpoint_health.items()}
+            }
+
+    def _session_get(self, url, params=None, headers=None, timeout=None, stream=False):
+        """
+        使用共享会话发送GET请求
+
+        Args:
+            url (str): 请求地址
+            params (dict): 请求参数
+            headers (dict): 请求头，默认使用DEFAULT_HEADERS
+            timeout (int or tuple): 请求超时时间（秒），可为(连接超时, 读取超时)
+            stream (bool): 是否流式读取响应体
+
+        Returns:
+            requests.Response: 响应对象
+        """
+        host, semaphore = self._host_slot(url)
+        metrics = VodSpider._host_metrics[host]
+        with VodSpider._shared_lock:
+            metrics["waiting"] += 1
+        with semaphore:
+            with VodSpider._shared_lock:
+                metrics["waiting"] -= 1
+                metrics["active"] += 1
+            try:
+                response = self._get_session().get(
+                    url, params=params, headers=headers or self.DEFAULT_HEADERS,
+                    timeout=timeout, stream=stream)
+            finally:
+                with VodSpider._shared_lock:
+                    metrics["active"] -= 1
+        response.encoding = 'utf-8'
+        return response
+
+    def _cache_key(self, url, params, list_view=False):
+        """
+        生成响应缓存键，参数按键排序并统一转为字符串
+
+        Args:
+            url (str): 请求地址
+            params (dict): 请求参数
+            list_view (bool): 是否为去掉了部分字段的列表请求，与完整响应分开缓存
+
+        Returns:
+            tuple: 缓存键
+        """
+        key = (url, tuple(sorted((str(k), str(v)) for k, v in params.items())))
+        return key + ("list",) if list_view else key
+
+    def _cache_ttl(self, params):
+        """
+        根据请求参数确定缓存有效期
+
+        Args:
+            params (dict): 请求参数
+
+        Returns:
+            int: 缓存有效期（秒）
+        """
+        if params.get("ids"):
+            return self.RESPONSE_CACHE_TTL["detail"]
+        if str(params.get("pg", params.get("page", "1"))) == "1" and not params.get("wd"):
+            return self.RESPONSE_CACHE_TTL["first_page"]
+        return self.RESPONSE_CACHE_TTL["default"]
+
+    def _cache_get(self, key):
+        """
+        读取响应缓存，过期条目会被删除
+
+        Args:
+            key (tuple): 缓存键
+
+        Returns:
+            dict or None: 命中时返回缓存数据，否则返回None
+        """
+        import time
+        with self._response_cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is None:
+                return None
+            expires, size, data = entry
+            if expires < time.time():
+                del self._response_cache[key]
+                self._response_cache_bytes -= size
+                return None
+            self._response_cache.move_to_end(key)
+            return data
+
+    def _cache_put(self, key, params, data, size):
+        """
+        写入响应缓存，超出条目数或字节数上限时淘汰最久未使用的条目
+
+        Args:
+            key (tuple): 缓存键
+            params (dict): 请求参数，用于确定有效期
+            data (dict): 解析后的响应数据
+            size (int): 响应体字节数
+        """
+        import time
+        if size > self.RESPONSE_CACHE_MAX_BYTES:
+            return
+        with self._response_cache_lock:
+            old = self._response_cache.pop(key, None)
+            if old is not None:
+                self._response_cache_bytes -= old[1]
+            self._response_cache[key] = (
+                time.time() + self._cache_ttl(params), size, data)
+            self._response_cache_bytes += size
+            while (len(self._response_cache) > self.RESPONSE_CACHE_MAX_ENTRIES
+                   or self._response_cache_bytes > self.RESPONSE_CACHE_MAX_BYTES):
+                _, (_, evicted_size, _) = self._response_cache.popitem(last=False)
+                self._response_cache_bytes -= evicted_size
+
+    def _single_flight(self, key, fn, *args):
+        """
+        合并相同的并发请求，同一个键同时只执行一次fn，其余调用方等待并共用结果
+
+        Args:
+            key (hashable): 请求键，与响应缓存键相同
+            fn (callable): 实际发起请求的函数
+            *args: 函数参数
+
+        Returns:
+            fn的返回值
+        """
+        with self._inflight_lock:
+            call = self._inflight_requests.get(key)
+            leader = call is None
+            if leader:
+                call = {"done": threading.Event(), "result": None}
+                self._inflight_requests[key] = call
+
+        if not leader:
+            call["done"].wait()
+            return call["result"]
+
+        try:
+            call["result"] = fn(*args)
+            return call["result"]
+        finally:
+            with self._inflight_lock:
+                del self._inflight_requests[key]
+            call["done"].set()
+
+    def _request_data(self, params, timeout=10, retries=None, list_view=False):
+        """
+        发送API请求并处理响应数据
+
+        Args:
+            params (dict): 请求参数
+            timeout (int): 请求超时时间（秒）
+            retries (int): 最大尝试次数，为None时使用重试策略的设置
+            list_view (bool): 是否只用于列表界面，是时解析前去掉LIST_SKIP_FIELDS中的字段
+
+        Returns:
+            dict or None: 成功时返回解析后的数据，失败时返回None
+        """
+        cache_key = self._cache_key(self.API_URL, params, list_view)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        return self._single_flight(
+            cache_key, self._fetch_api_data, params, cache_key, timeout, retries, list_view)
+
+    async def _request_data_async(self, params, timeout=10, retries=None, list_view=False):
+        """
+        _request_data的协程版本，在共享事件循环中发送API请求
+
+        Args:
+            params (dict): 请求参数
+            timeout (int): 请求超时时间（秒）
+            retries (int): 最大尝试次数，为None时使用重试策略的设置
+            list_view (bool): 是否只用于列表界面，是时解析前去掉LIST_SKIP_FIELDS中的字段
+
+        Returns:
+            dict or None: 成功时返回解析后的数据，失败时返回None
+        """
+        cache_key = self._cache_key(self.API_URL, params, list_view)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        return await self._single_flight_async(
+            cache_key, self._fetch_json_async, self._api_endpoints(self.API_URL, self.API_MIRRORS),
+            params, cache_key, timeout, retries, self._accept_api_data, list_view)
+
+    async def _single_flight_async(self, key, fn, *args):
+        """
+        _single_flight的协程版本，同一个键同时只执行一次fn，其余协程等待并共用结果，
+        等待方被取消时不影响正在进行的请求
+
+        Args:
+            key (hashable): 请求键，与响应缓存键相同
+            fn (callable): 实际发起请求的协程函数
+            *args: 函数参数
+
+        Returns:
+            fn的返回值
+        """
+        import asyncio
+
+        task = self._async_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args))
+            self._async_inflight[key] = task
+            task.add_done_callback(
+                lambda _: self._async_inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def _accept_api_data(self, data):
+        """
+        判断API接口返回的数据是否可用
+
+        Args:
+            data (dict): 解析后的数据
+
+        Returns:
+            bool: 数据可用时返回True
+        """
+        return ("code" in data and data["code"] in (0, 1)) or "list" in data
+
+    def _fetch_api_data(self, params, cache_key, timeout, retries, list_view):
+        """
+        请求API接口并缓存成功的响应
+
+        Args:
+            params (dict): 请求参数
+            cache_key (tuple): 响应缓存键
+            timeout (int): 请求超时时间（秒）
+            retries (int): 最大尝试次数，为None时使用重试策略的设置
+            list_view (bool): 是否只用于列表界面
+
+        Returns:
+            dict or None: 成功时返回解析后的数据，失败时返回None
+        """
+        return self._fetch_json(
+            self._api_endpoints(self.API_URL, self.API_MIRRORS), params, cache_key, timeout, retries,
+            self._accept_api_data, list_view)
+
+    def _request_ajax_data(self, tid, pg, limit=20):
+        """
+        通过AJAX接口请求数据
+
+        Args:
+            tid (str): 分类ID
+            pg (str): 页码
+            limit (int): 每页数据数量
+
+        Returns:
+            dict or None: 成功时返回解析后的数据，失败时返回None
+        """
+        # 未配置AJAX接口的站点直接使用API接口
+        if not self.AJAX_API_URL:
+            return None
+
+        params = {
+            "mid": "1",
+            "tid": tid,
+            "page": pg,
+            "limit": limit
+        }
+        cache_key = self._cache_key(self.AJAX_API_URL, params, True)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        return self._single_flight(
+            cache_key, self._fetch_ajax_data, params, cache_key)
+
+    async def _request_ajax_data_async(self, tid, pg, limit=20):
+        """
+        _request_ajax_data的协程版本，在共享事件循环中请求AJAX接口
+
+        Args:
+            tid (str): 分类ID
+            pg (str): 页码
+            limit (int): 每页数据数量
+
+        Returns:
+            dict or None: 成功时返回解析后的数据，失败时返回None
+        """
+        if not self.AJAX_API_URL:
+            return None
+
+        params = {
+            "mid": "1",
+            "tid": tid,
+            "page": pg,
+            "limit": limit
+        }
+        cache_key = self._cache_key(self.AJAX_API_URL, params, True)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        return await self._single_flight_async(
+            cache_key, self._fetch_json_async, self._api_endpoints(self.AJAX_API_URL, self.AJAX_API_MIRRORS),
+            params, cache_key, 10, None, self._accept_ajax_data, True)
+
+    def _accept_ajax_data(self, data):
+        """
+        判断AJAX接口返回的数据是否可用
+
+        Args:
+            data (dict): 解析后的数据
+
+        Returns:
+            bool: 数据可用时返回True
+        """
+        return "list" in data
+
+    def _fetch_ajax_data(self, params, cache_key):
+        """
+        请求AJAX接口并缓存成功的响应
+
+        Args:
+            params (dict): 请求参数
+            cache_key (tuple): 响应缓存键
+
+        Returns:
+            dict or None: 成功时返回解析后的数据，失败时返回None
+        """
+        return self._fetch_json(
+            self._api_endpoints(self.AJAX_API_URL, self.AJAX_API_MIRRORS), params, cache_key, 10, None,
+            self._accept_ajax_data, True)
+
+    def _fetch_json(self, urls, params, cache_key, timeout, retries, accept, list_view=False):
+        """
+        按_fetch_json_steps的步骤请求JSON接口，在当前线程中阻塞执行
+
+        Args:
+            urls (list): 接口地址及其镜像
+            params (dict): 请求参数
+            cache_key (tuple): 响应缓存键
+            timeout (int): 单次请求超时时间（秒）
+            retries (int): 最大尝试次数，为None时使用重试策略的设置
+            accept (callable): 判断解析后的数据是否可用
+            list_view (bool): 是否只用于列表界面
+
+        Returns:
+            dict or None: 成功时返回解析后的数据，失败时返回None
+        """
+        import time
+        import requests
+
+        steps = self._fetch_json_steps(
+            urls, params, cache_key, timeout, retries, accept, list_view)
+        reply = None
+        while True:
+            try:
+                step = steps.send(reply)
+            except StopIteration as stop:
+                return stop.value
+            if step[0] == "sleep":
+                time.sleep(step[1])
+                reply = None
+                continue
+            try:
+                response = self._session_get(
+                    step[1], params=params, headers=self.DEFAULT_HEADERS, timeout=step[2])
+                reply = (response.status_code, response.content, None)
+            except requests.RequestException as e:
+                reply = (None, None, e)
+
+    async def _fetch_json_async(self, urls, params, cache_key, timeout, retries, accept, list_view=False):
+        """
+        _fetch_json的协程版本，请求和退避等待都不阻塞事件循环
+
+        Args:
+            urls (list): 接口地址及其镜像
+            params (dict): 请求参数
+            cache_key (tuple): 响应缓存键
+            timeout (int): 单次请求超时时间（秒）
+            retries (int): 最大尝试次数，为None时使用重试策略的设置
+            accept (callable): 判断解析后的数据是否可用
+            list_view (bool): 是否只用于列表界面
+
+        Returns:
+            dict or None: 成功时返回解析后的数据，失败时返回None
+        """
+        import asyncio
+        import requests
+
+        errors = (requests.RequestException, asyncio.TimeoutError)
+        try:
+            import aiohttp
+            errors += (aiohttp.ClientError,)
+        except ImportError:
+            pass
+
+        steps = self._fetch_json_steps(
+            urls, params, cache_key, timeout, retries, accept, list_view)
+        reply = None
+        while True:
+            try:
+                step = steps.send(reply)
+            except StopIteration as stop:
+                return stop.value
+            if step[0] == "sleep":
+                await asyncio.sleep(step[1])
+                reply = None
+                continue
+            try:
+                status, content = await self._async_get(step[1], params, step[2])
+                reply = (status, content, None)
+            except errors as e:
+                reply = (None, None, e)
+
+    def _fetch_json_steps(self, urls, params, cache_key, timeout, retries, accept, list_view=False):
+        """
+        按重试策略请求JSON接口：只重试网络错误和服务端临时错误，有镜像时失败后立即换用其他镜像，
+        所有镜像都失败过才按带抖动的指数退避等待，总耗时不超过本次调用的时间预算，主机熔断期间直接跳过
+        请求和等待由调用方执行，同步和协程版本共用同一套重试逻辑
+
+        Args:
+            urls (list): 接口地址及其镜像
+            params (dict): 请求参数
+            cache_key (tuple): 响应缓存键
+            timeout (int): 单次请求超时时间（秒）
+            retries (int): 最大尝试次数，为None时使用重试策略的设置
+            accept (callable): 判断解析后的数据是否可用
+            list_view (bool): 是否只用于列表界面，是时解析前去掉LIST_SKIP_FIELDS中的字段
+
+        Yields:
+            tuple: ("get", url, timeout)时调用方发送(status_code, content, error)，
+                ("sleep", delay)时调用方等待delay秒后发送None
+
+        Returns:
+            dict or None: 成功时返回解析后的数据，失败时返回None
+        """
+        import time
+        from urllib import parse
+
+        policy = self.RETRY_POLICY
+        deadline = self._call_deadline()
+        attempts = policy.max_attempts if retries is None else retries
+        failed_hosts = set()
+
+        for attempt in range(attempts):
+            # 首次请求总会发出，之后的重试和镜像切换受剩余预算限制，预算用完时直接放弃
+            # 预算检查放在选择镜像之前，选中冷却结束的主机后就必须发出探测请求并记录结果
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                if attempt > 0:
+                    return None
+                attempt_timeout = timeout
+            else:
+                attempt_timeout = min(timeout, remaining)
+
+            # 每次尝试选择最健康的镜像，本次调用中失败过的镜像排在最后
+            url = self._pick_endpoint(urls, failed_hosts)
+            if url is None:
+                return None
+            host = parse.urlparse(url).netloc
+
+            started = time.time()
+            try:
+                status, content, error = yield ("get", url, attempt_timeout)
+            except GeneratorExit:
+                # 调用方放弃了请求（如协程被取消），没有结果可记录，放开试探名额以免主机一直被拒绝
+                self._breaker_release(host)
+                raise
+            if error is not None:
+                retryable = policy.retryable(error=error)
+                ok = not retryable
+            else:
+                # 服务端错误和网络错误计入熔断，其余响应说明主机可用
+                ok = status < 500
+                retryable = policy.retryable(status=status)
+            self._breaker_record(host, ok)
+            self._record_endpoint(host, time.time() - started, ok)
+
+            if ok and status == 200:
+                if list_view:
+                    content = self._skip_json_fields(content, self.LIST_SKIP_FIELDS)
+                try:
+                    data = self._json_loads(content)
+                except ValueError:
+                    return None
+                if isinstance(data, dict) and accept(data):
+                    self._cache_put(cache_key, params, data, len(content))
+                    return data
+                return None
+
+            failed_hosts.add(host)
+            if not retryable or attempt == attempts - 1:
+                return None
+            # 还有没失败过的镜像时立即切换，所有镜像都失败过才退避等待
+            if len(failed_hosts) >= len(urls):
+                delay = policy.delay(attempt)
+                if time.time() + delay >= deadline:
+                    return None
+                yield ("sleep", delay)
+
+        return None
+
+    def _json_loads(self, content):
+        """
+        直接从响应的原始字节解析JSON，按JSON_BACKEND选择解析函数，
+        响应中有非法UTF-8字节时按替换字符解码后再用标准库解析
+
+        Args:
+            content (bytes): 响应体
+
+        Returns:
+            解析后的数据
+
+        Raises:
+            ValueError: 响应体不是合法的JSON
+        """
+        loads = self._json_decoder()
+        try:
+            return loads(content)
+        except ValueError:
+            return json.loads(content.decode('utf-8', 'replace'))
+
+    def _json_decoder(self):
+        """
+        获取JSON_BACKEND对应的解析函数
+
+        Returns:
+            callable: 接受bytes的解析函数，"auto"时未安装orjson则使用标准库
+        """
+        backend = self.JSON_BACKEND
+        if callable(backend):
+            return backend
+        if backend == "auto":
+            if VodSpider._orjson_loads is None:
+                try:
+                    import orjson
+                    VodSpider._orjson_loads = orjson.loads
+                except ImportError:
+                    VodSpider._orjson_loads = False
+            if VodSpider._orjson_loads:
+                return VodSpider._orjson_loads
+        return json.loads
+
+    def _skip_json_fields(self, content, fields):
+        """
+        解析前从响应体中去掉指定的字符串字段，只处理紧跟在逗号后的"字段名":"值"，值为null等其他情况原样保留，
+        去掉的长字符串不再经过JSON解码，列表页的解析时间随之减少
+
+        Args:
+            content (bytes): 响应体
+            fields (tuple): 需要去掉的字段名
+
+        Returns:
+            bytes: 去掉字段后的响应体，没有需要去掉的字段时返回原内容
+        """
+        if not fields:
+            return content
+        pattern = VodSpider._json_skip_patterns.get(fields)
+        if pattern is None:
+            pattern = re.compile(rb',\s*"(?:' + b'|'.join(
+                re.escape(field.encode('utf-8')) for field in fields) + rb')"\s*:\s*"')
+            VodSpider._json_skip_patterns[fields] = pattern
+
+        parts = []
+        position = 0
+        find = content.find
+        for match in pattern.finditer(content):
+            start = match.start()
+            if start < position:
+                continue
+            # 找到字符串值的结束引号，前面有奇数个反斜杠的引号是转义字符
+            end = match.end()
+            while True:
+                quote = find(b'"', end)
+                if quote == -1:
+                    return content
+                backslash = quote
+                while content[backslash - 1] == 0x5c:
+                    backslash -= 1
+                if (quote - backslash) % 2 == 0:
+                    break
+                end = quote + 1
+            parts.append(content[position:start])
+            position = quote + 1
+
+        if not parts:
+            return content
+        parts.append(content[position:])
+        return b''.join(parts)
+
+    def _api_endpoints(self, primary, mirrors):
+        """
+        合并主接口地址和镜像地址，去掉重复项
+
+        Args:
+            primary (str): 主接口地址
+            mirrors (iterable): 镜像地址
+
+        Returns:
+            list: 接口地址列表，主接口在前
+        """
+        endpoints = [primary] if primary else []
+        for mirror in mirrors:
+            if mirror and mirror not in endpoints:
+                endpoints.append(mirror)
+        return endpoints
+
+    def _pick_endpoint(self, urls, failed_hosts):
+        """
+        按延迟和错误率选择最健康的接口地址，跳过熔断中的主机
+
+        Args:
+            urls (list): 候选接口地址，主接口在前
+            failed_hosts (set): 本次调用中已失败的主机
+
+        Returns:
+            str or None: 接口地址，全部熔断时返回None
+        """
+        from urllib import parse
+
+        if len(urls) == 1:
+            return urls[0] if self._breaker_allow(parse.urlparse(urls[0]).netloc) else None
+
+        ranked = []
+        for index, url in enumerate(urls):
+            host = parse.urlparse(url).netloc
+            ranked.append(
+                (host in failed_hosts, self._endpoint_score(host), index, url, host))
+        ranked.sort()
+        for _, _, _, url, host in ranked:
+            if self._breaker_allow(host):
+                return url
+        return None
+
+    def _endpoint_score(self, host):
+        """
+        计算主机的健康评分，越小越好:平均延迟按错误率放大，没有记录的主机按ENDPOINT_DEFAULT_LATENCY计算
+
+        Args:
+            host (str): 主机名
+
+        Returns:
+            float: 健康评分
+        """
+        with VodSpider._shared_lock:
+            health = VodSpider._endpoint_health.get(host)
+            if health is None:
+                return self.ENDPOINT_DEFAULT_LATENCY
+            return health["latency"] / max(0.05, 1 - health["error_rate"])
+
+    def _record_endpoint(self, host, elapsed, ok):
+        """
+        更新主机的滑动平均延迟和错误率
+
+        Args:
+            host (str): 主机名
+            elapsed (float): 请求耗时（秒）
+            ok (bool): 主机是否正常响应
+        """
+        alpha = self.ENDPOINT_HEALTH_ALPHA
+        with VodSpider._shared_lock:
+            health = VodSpider._endpoint_health.get(host)
+            if health is None:
+                VodSpider._endpoint_health[host] = {
+                    "latency": elapsed, "error_rate": 0.0 if ok else 1.0, "count": 1}
+                return
+            health["latency"] += alpha * (elapsed - health["latency"])
+            health["error_rate"] += alpha * \
+                ((0.0 if ok else 1.0) - health["error_rate"])
+            health["count"] += 1
+
+    def _begin_call(self, budget=None):
+        """
+        开始一次界面调用，设置本线程及其提交到共享线程池和事件循环的任务的时间预算
+
+        Args:
+            budget (float): 时间预算（秒），默认为重试策略的设置
+        """
+        import time
+
+        budget = self.RETRY_POLICY.budget if budget is None else budget
+        VodSpider._call_deadline_var.set(time.time() + budget)
+
+    def _call_deadline(self):
+        """
+        获取当前调用的截止时间，不在界面调用中时按重试策略的时间预算从现在开始计算
+
+        Returns:
+            float: 截止时间戳
+        """
+        import time
+
+        deadline = VodSpider._call_deadline_var.get()
+        if deadline is None:
+            deadline = time.time() + self.RETRY_POLICY.budget
+        return deadline
+
+    def _breaker_allow(self, host):
+        """
+        检查主机的熔断状态，熔断期间直接拒绝，冷却时间过后放行一个试探请求
+
+        Args:
+            host (str): 主机名
+
+        Returns:
+            bool: 是否允许发出请求
+        """
+        import time
+
+        with VodSpider._shared_lock:
+            breaker = VodSpider._host_breakers.get(host)
+            if breaker is None or breaker["opened_at"] is None:
+                return True
+            if breaker["probing"] or time.time() - breaker["opened_at"] < self.BREAKER_RESET_TIMEOUT:
+                return False
+            breaker["probing"] = True
+            return True
+
+    def _breaker_release(self, host):
+        """
+        放弃主机的试探请求而不记录结果，冷却时间过后的下一个请求可以重新试探
+
+        Args:
+            host (str): 主机名
+        """
+        with VodSpider._shared_lock:
+            breaker = VodSpider._host_breakers.get(host)
+            if breaker is not None:
+                breaker["probing"] = False
+
+    def _breaker_record(self, host, ok):
+        """
+        记录主机的请求结果，连续失败达到阈值或试探请求失败时熔断
+
+        Args:
+            host (str): 主机名
+            ok (bool): 主机是否正常响应
+        """
+        import time
+
+        with VodSpider._shared_lock:
+            breaker = VodSpider._host_breakers.get(host)
+            if ok:
+                if breaker is not None:
+                    del VodSpider._host_breakers[host]
+                return
+            if breaker is None:
+                breaker = {"failures": 0, "opened_at": None, "probing": False}
+                VodSpider._host_breakers[host] = breaker
+            breaker["failures"] += 1
+            trip = breaker["probing"] or (
+                breaker["opened_at"] is None and breaker["failures"] >= self.BREAKER_FAILURE_THRESHOLD)
+            breaker["probing"] = False
+            if trip:
+                breaker["opened_at"] = time.time()
+        if trip:
+            self.log(f"主机连续请求失败，暂停请求{self.BREAKER_RESET_TIMEOUT}秒: {host}")
+
+    def _normalize_type_id(self, type_id):
+        """
+        将分类ID统一转换为整数，接口返回的type_id可能是字符串或整数
+
+        Args:
+            type_id (str or int): 原始分类ID
+
+        Returns:
+            int or str: 可转换时返回整数，否则原样返回
+        """
+        try:
+            return int(type_id)
+        except (TypeError, ValueError):
+            return type_id
+
+    def _build_excluded_type_ids(self):
+        """
+        根据EXCLUDE_CATEGORIES构建排除分类ID集合
+
+        Returns:
+            frozenset: 规范化后的排除分类ID集合
+        """
+        return frozenset(self._normalize_type_id(cat_id) for cat_id in self.EXCLUDE_CATEGORIES)
+
+    def _build_video_list(self, items):
+        """
+        构建列表界面的视频列表，过滤掉排除分类中的视频
+
+        Args:
+            items (list): 原始视频信息列表
+
+        Returns:
+            list: 只包含列表界面字段的视频信息列表
+        """
+        excluded = self._excluded_type_ids
+        normalize = self._normalize_type_id
+        return [
+            self._build_video_object(item, True)
+            for item in items
+            if normalize(item.get("type_id")) not in excluded
+        ]
+
+    def _build_video_object(self, item, list_view=False):
+        """
+        构建视频对象，处理视频信息
+        列表界面只显示名称、图片和备注，简介的HTML清理和演员、导演等字段留到detailContent中生成
+
+        Args:
+            item (dict): 原始视频信息字典
+            list_view (bool): 是否只生成列表界面需要的字段
+
+        Returns:
+            dict: 标准格式的视频信息字典
+        """
+        vod_pic = item.get("vod_pic", "")
+        if vod_pic and not vod_pic.startswith(('http://', 'https://')):
+            vod_pic = self.IMAGE_BASE_URL + "/" + vod_pic.lstrip('/')
+
+        vod_id = str(item["vod_id"])
+        vod_remarks = item.get("vod_remarks", "")
+        # 只记录下来，建立片名索引的工作推迟到检索时或攒够一批后在后台进行
+        # 事件循环、线程池和界面线程会同时构建视频对象，追加和判断批量都要持锁
+        with self._title_index_lock:
+            self._title_pending.append(
+                (vod_id, item["vod_name"], vod_pic, vod_remarks))
+            schedule = (not self._title_flush_scheduled and
+                        len(self._title_pending) >= self.TITLE_INDEX_FLUSH_BATCH)
+            if schedule:
+                self._title_flush_scheduled = True
+        if schedule:
+            self._submit_shared(self._flush_title_index)
+
+        video = {
+            "vod_id": vod_id,
+            "vod_name": item["vod_name"],
+            "vod_pic": vod_pic,
+            "vod_remarks": vod_remarks
+        }
+        if list_view:
+            return video
+
+        video.update({
+            "vod_time": item.get("vod_time", ""),
+            "vod_year": item.get("vod_year", ""),
+            "vod_area": item.get("vod_area", ""),
+            "vod_lang": item.get("vod_lang", ""),
+            "vod_actor": item.get("vod_actor", ""),
+            "vod_director": item.get("vod_director", ""),
+            "vod_content": self.removeHtmlTags(item.get("vod_content", "")),
+            "type_name": item.get("type_name", "")
+        })
+        return video
+
+    def getName(self):
+        """
+        获取爬虫名称
+
+        Returns:
+            str: 爬虫名称
+        """
+        return self.SPIDER_NAME
+
+    def init(self, extend=""):
+        """
+        初始化方法，继承类需要设置以下类属性：
+        - self.API_URL
+        - self.IMAGE_BASE_URL
+        - self.EXCLUDE_CATEGORIES
+        - self.DEFAULT_HEADERS
+        - self.SPIDER_NAME
+        - self.AJAX_API_URL
+
+        未声明站点配置的通用爬虫通过extend指定站点，extend可以是：
+        - JSON对象，字段见SITE_CONFIG_FIELDS
+        - api.json中sites的key，从爬虫目录上一级的api.json读取配置
+        - key@注册表，注册表为api.json的文件路径或http(s)地址
+
+        Args:
+            extend (str): 扩展参数
+        """
+        site = self._resolve_site_config(extend)
+        if site:
+            for attr, value in self._site_config_attrs(site).items():
+                setattr(self, attr, value)
+        if not self.API_URL:
+            self.log(f"未配置站点API地址，请检查ext: {extend}")
+        self._excluded_type_ids = self._build_excluded_type_ids()
+        # 在后台加载磁盘上的片名索引，避免首次快速搜索时等待
+        self._submit_shared(self._flush_title_index)
+        if self.CATALOG_SYNC_ENABLED:
+            self._start_catalog_sync()
+
+    def _resolve_site_config(self, extend):
+        """
+        解析init传入的扩展参数，得到站点配置
+
+        Args:
+            extend (str): JSON格式的站点配置、站点key或key@注册表
+
+        Returns:
+            dict or None: 站点配置，无法识别时返回None
+        """
+        if isinstance(extend, dict):
+            return extend
+        if not extend or not isinstance(extend, str):
+            return None
+        extend = extend.strip()
+        if extend.startswith('{'):
+            try:
+                site = json.loads(extend)
+            except ValueError as e:
+                self.log(f"站点配置不是合法的JSON: {e}")
+                return None
+            return site if isinstance(site, dict) else None
+
+        key, _, registry = extend.partition('@')
+        if registry:
+            self.SITE_REGISTRY_PATH = registry.strip()
+            # 之前下载失败的远程注册表在初始化时重新下载
+            with VodSpider._site_lock:
+                cached = VodSpider._site_registry.get(self.SITE_REGISTRY_PATH)
+                if cached is not None and cached[0] is None:
+                    del VodSpider._site_registry[self.SITE_REGISTRY_PATH]
+        site = self._load_site_registry().get(key.strip())
+        if site is None:
+            self.log(f"站点注册表中没有站点: {key}, 注册表: {self.SITE_REGISTRY_PATH}")
+        return site
+
+    def _site_config_attrs(self, site):
+        """
+        将站点配置转换为站点配置类属性，缺少的字段使用VodSpider的默认值
+
+        Args:
+            site (dict): 注册表中的站点配置
+
+        Returns:
+            dict: 类属性名到值的映射
+        """
+        attrs = {}
+        for field, attr in self.SITE_CONFIG_FIELDS.items():
+            value = site.get(field)
+            if value is None or value == "":
+                value = getattr(VodSpider, attr)
+            elif attr == "EXCLUDE_CATEGORIES":
+                value = frozenset(value)
+            elif attr in ("FILTER_KEYWORDS", "API_MIRRORS", "AJAX_API_MIRRORS"):
+                value = tuple(value)
+            attrs[attr] = value
+        return attrs
+
+    def _load_registry(self):
+        """
+        读取api.json，本地文件未修改时复用已解析的结果，http(s)地址只在首次使用和init时下载，
+        读取失败时记录日志，同一文件修改前不再重复读取
+        sites只收录api为苹果CMS采集接口(provide/vod)的站点，rules编译为播放列表规则
+
+        Returns:
+            tuple: (站点key到站点配置的映射, _compile_playlist_rules返回的规则)，读取失败时为空
+        """
+        path = self.SITE_REGISTRY_PATH
+        remote = path.startswith(('http://', 'https://'))
+        if remote:
+            mtime = 0
+        else:
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError as e:
+                mtime = None
+                error = e
+
+        with VodSpider._site_lock:
+            registry = VodSpider._site_registry.get(path)
+            if registry is not None and (remote or registry[0] == mtime):
+                return registry[1], registry[2]
+
+        if mtime is None:
+            config = None
+            self.log(f"站点注册表不存在: {path}, {error}")
+        else:
+            try:
+                if remote:
+                    response = self._session_get(path, timeout=10)
+                    response.raise_for_status()
+                    config = json.loads(response.content)
+                else:
+                    with open(path, encoding='utf-8') as f:
+                        config = json.load(f)
+            except (OSError, ValueError) as e:
+                config = None
+                self.log(f"读取站点注册表失败: {path}, {e}")
+        if not isinstance(config, dict):
+            # 读取失败的结果也记录下来，避免每次使用注册表都重复读取和记录日志
+            with VodSpider._site_lock:
+                VodSpider._site_registry[path] = (None if remote else mtime, {}, None)
+            return {}, None
+
+        sites = {}
+        for site in config.get("sites", []):
+            if not isinstance(site, dict) or not site.get("key"):
+                continue
+            if "provide/vod" not in str(site.get("api", "")):
+                continue
+            sites[site["key"]] = site
+        rules = self._compile_playlist_rules(config.get("rules"))
+
+        with VodSpider._site_lock:
+            VodSpider._site_registry[path] = (mtime, sites, rules)
+        return sites, rules
+
+    def _load_site_registry(self):
+        """
+        读取api.json中的sites作为站点注册表
+
+        Returns:
+            dict: 站点key到站点配置的映射，读取失败时返回空字典
+        """
+        return self._load_registry()[0]
+
+    def _compile_playlist_rules(self, rules):
+        """
+        编译api.json中的rules：所有规则的hosts通配符合并为一个正则，每条规则的regex合并为一个字节正则
+        没有regex的规则（如只含script等播放器专用字段）不收录
+
+        Args:
+            rules (list): api.json中的rules
+
+        Returns:
+            dict or None: 没有可用规则时返回None
+                - hosts: 匹配主机名的正则，命名分组r{i}对应第i条规则
+                - rules: [(规则名称, 编译后的字节正则)]
+        """
+        import fnmatch
+
+        host_patterns = []
+        compiled = []
+        for rule in rules if isinstance(rules, list) else []:
+            if not isinstance(rule, dict):
+                continue
+            hosts = [str(host) for host in rule.get("hosts", []) if host]
+            patterns = []
+            for regex in rule.get("regex", []):
+                try:
+                    re.compile(regex)
+                except (re.error, TypeError) as e:
+                    self.log(f"规则{rule.get('name')}的正则无效: {regex}, {e}")
+                    continue
+                patterns.append(f"(?:{regex})")
+            if not hosts or not patterns:
+                continue
+
+            group = f"r{len(compiled)}"
+            host_patterns.append(
+                f"(?P<{group}>" + "|".join(fnmatch.translate(host.lower()) for host in hosts) + ")")
+            compiled.append((rule.get("name", group), re.compile(
+                "|".join(patterns).encode('utf-8'))))
+
+        if not compiled:
+            return None
+        return {"hosts": re.compile("|".join(host_patterns)), "rules": compiled}
+
+    def _playlist_rule(self, url):
+        """
+        查找播放列表地址适用的api.json规则，多条规则匹配时使用排在前面的规则
+
+        Args:
+            url (str): 播放列表地址
+
+        Returns:
+            tuple or None: (规则名称, 编译后的字节正则)，没有匹配的规则时返回None
+        """
+        from urllib import parse
+
+        rules = self._load_registry()[1]
+        if rules is None:
+            return None
+        host = (parse.urlparse(url).hostname or "").lower()
+        match = rules["hosts"].match(host)
+        if match is None:
+            return None
+        return rules["rules"][int(match.lastgroup[1:])]
+
+    def _site_keys(self):
+        """
+        获取站点注册表中的所有站点key
+
+        Returns:
+            list: 站点key列表，顺序与api.json一致
+        """
+        return list(self._load_site_registry())
+
+    def _get_site_spider(self, key):
+        """
+        获取注册表中某个站点的爬虫，首次使用时按站点配置生成只含配置的VodSpider子类并实例化
+
+        Args:
+            key (str): api.json中站点的key
+
+        Returns:
+            VodSpider or None: 站点爬虫，站点不存在时返回None
+        """
+        with VodSpider._site_lock:
+            spider = VodSpider._site_spiders.get(key)
+        if spider is not None:
+            return spider
+
+        site = self._load_site_registry().get(key)
+        if site is None:
+            return None
+
+        # 每个站点单独一个子类，_instance置空以兼容按类缓存实例的基类
+        attrs = self._site_config_attrs(site)
+        attrs["_instance"] = None
+        spider_class = type(f"Spider_{key}", (VodSpider,), attrs)
+        spider = spider_class()
+        spider.init()
+
+        with VodSpider._site_lock:
+            return VodSpider._site_spiders.setdefault(key, spider)
+
+    def _categorize_without_pid(self, all_categories):
+        """
+        处理没有type_pid字段的分类数据，根据分类名称进行分类
+
+        Args:
+            all_categories (list): 原始分类数据列表
+
+        Returns:
+            tuple: (primary_categories, sub_categories_map)
+                - primary_categories: 主分类列表
+                - sub_categories_map: 子分类映射表，以主分类ID为键
+        """
+        primary_categories = []
+        sub_categories_map = {}
+
+        # 首先识别主分类
+        for cat in all_categories:
+            type_id = cat.get("type_id")
+            type_name = cat.get("type_name", "")
+
+            # 精准匹配主分类关键词
+            is_primary = type_name in self.PRIMARY_CATEGORIES_KEYWORDS
+
+            # 精准匹配二级分类映射中的键
+            is_primary_by_map = type_name in self.SECONDARY_CATEGORIES_MAP.keys()
+
+            if is_primary or is_primary_by_map:
+                primary_categories.append({
+                    "type_id": str(type_id),
+                    "type_name": type_name
+                })
+
+        # 然后建立子分类映射
+        for primary_cat in primary_categories:
+            primary_name = primary_cat["type_name"]
+            primary_id = primary_cat["type_id"]
+
+            # 检查该主分类下是否有子分类映射
+            if primary_name in self.SECONDARY_CATEGORIES_MAP:
+                sub_keywords = self.SECONDARY_CATEGORIES_MAP[primary_name]
+
+                # 查找该主分类下的子分类
+                sub_categories = []
+                for cat in all_categories:
+                    type_id = cat.get("type_id")
+                    type_name = cat.get("type_name", "")
+
+                    # 精准匹配子分类关键字
+                    if type_name in sub_keywords and str(type_id) != primary_id:
+                        sub_categories.append({
+                            "n": type_name,
+                            "v": str(type_id)
+                        })
+
+                if sub_categories:
+                    sub_categories_map[primary_id] = sub_categories
+
+        return primary_categories, sub_categories_map
+
+    def _fetch_categories(self):
+        """
+        获取分类信息，包括主分类和子分类，并缓存结果
+        如果原始数据没有type_pid字段，则根据分类名称进行智能分类
+
+        Returns:
+            tuple: (primary_categories, sub_categories_map)
+                - primary_categories: 主分类列表
+                - sub_categories_map: 子分类映射表，以主分类ID为键
+        """
+        import time
+
+        # 冷启动时先使用磁盘上的分类数据
+        if self.CATEGORY_CACHE is None:
+            all_categories, saved_at = self._load_disk_cache("categories.json")
+            if all_categories:
+                self.CATEGORY_CACHE = self._build_category_tree(all_categories)
+                self._category_cached_at = saved_at
+
+        if self.CATEGORY_CACHE:
+            # 过期后仍先返回旧数据，在后台重新获取
+            if time.time() - self._category_cached_at > self.CATEGORY_CACHE_TTL:
+                self._revalidate("categories", self._refresh_categories)
+            return self.CATEGORY_CACHE
+
+        return self._refresh_categories() or ([], {})
+
+    def _refresh_categories(self):
+        """
+        从接口获取分类数据，更新内存缓存并写入磁盘
+
+        Returns:
+            tuple or None: (primary_categories, sub_categories_map)，请求失败时返回None
+        """
+        import time
+
+        params = {"ac": "list", "pg": "1"}
+        data = self._request_data(params)
+        if not data or not data.get("class"):
+            return None
+
+        tree = self._build_category_tree(data["class"])
+        self.CATEGORY_CACHE = tree
+        self._category_cached_at = time.time()
+        self._save_disk_cache("categories.json", data["class"])
+        return tree
+
+    def _build_category_tree(self, all_categories):
+        """
+        根据接口返回的分类列表构建主分类和子分类
+
+        Args:
+            all_categories (list): 接口返回的class列表
+
+        Returns:
+            tuple: (primary_categories, sub_categories_map)
+        """
+        # 检查是否有type_pid字段，如果没有则使用智能分类
+        has_type_pid = any("type_pid" in cat for cat in all_categories)
+
+        if has_type_pid:
+            # 有type_pid字段的处理方式
+            primary_categories = []
+            sub_categories_map = {}
+
+            for cat in all_categories:
+                if self._normalize_type_id(cat.get("type_id")) in self._excluded_type_ids:
+                    continue
+
+                type_id = cat.get("type_id")
+                type_pid = cat.get("type_pid", 0)
+
+                if type_pid == 0:
+                    primary_categories.append({
+                        "type_id": str(type_id),
+                        "type_name": cat["type_name"]
+                    })
+                else:
+                    pid_str = str(type_pid)
+                    if pid_str not in sub_categories_map:
+                        sub_categories_map[pid_str] = []
+                    sub_categories_map[pid_str].append(
+                        {"n": cat["type_name"], "v": str(type_id)})
+
+            return primary_categories, sub_categories_map
+        else:
+            # 没有type_pid字段的处理方式，使用智能分类
+            return self._categorize_without_pid(all_categories)
+
+    def _revalidate(self, name, fn):
+        """
+        在后台刷新过期的缓存，同一缓存同时只刷新一次
+
+        Args:
+            name (str): 缓存名称
+            fn (callable): 刷新函数
+        """
+        with self._revalidate_lock:
+            if name in self._revalidating:
+                return
+            self._revalidating.add(name)
+
+        def run():
+            try:
+                fn()
+            finally:
+                with self._revalidate_lock:
+                    self._revalidating.discard(name)
+
+        self._submit_shared(run)
+
+    def _load_disk_cache(self, name):
+        """
+        读取本站的磁盘缓存
+
+        Args:
+            name (str): 缓存文件名
+
+        Returns:
+            tuple: (缓存内容, 保存时间戳)，没有缓存或读取失败时返回(None, 0)
+        """
+        path = self._site_cache_path(name)
+        try:
+            with open(path, encoding='utf-8') as f:
+                cached = json.load(f)
+            return cached["value"], float(cached["saved_at"])
+        except FileNotFoundError:
+            return None, 0
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.log(f"读取缓存失败: {path}, {e}")
+            return None, 0
+
+    def _save_disk_cache(self, name, value):
+        """
+        写入本站的磁盘缓存，先写临时文件再替换
+
+        Args:
+            name (str): 缓存文件名
+            value: 可以JSON序列化的缓存内容
+        """
+        import time
+
+        path = self._site_cache_path(name)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.CACHE_DIR, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"saved_at": time.time(), "value": value},
+                          f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            self.log(f"保存缓存失败: {path}, {e}")
+
+    def homeContent(self, filter):
+        """
+        获取首页内容，包括分类和筛选条件
+
+        Args:
+            filter (bool): 是否启用筛选条件
+
+        Returns:
+            dict: 包含分类和筛选条件的字典
+        """
+        self._begin_call()
+        try:
+            primary_categories, sub_categories_map = self._fetch_categories()
+
+            filters = {}
+            if filter:
+                filters = self._build_filter_options(sub_categories_map)
+
+            result = {
+                "class": primary_categories,
+                "filters": filters
+            }
+            return result
+        except Exception as e:
+            return {"class": [], "filters": {}}
+
+    def _build_filter_options(self, sub_categories):
+        """
+        构建筛选选项，为每个子分类生成筛选条件
+
+        Args:
+            sub_categories (dict): 子分类映射表
+
+        Returns:
+            dict: 筛选选项配置
+        """
+        filters = {}
+
+        for cat_id, sub_cats in sub_categories.items():
+            filter_options = [
+                {"key": "type_id", "name": "类型", "value": [
+                    {"n": "全部", "v": ""},
+                    *sub_cats
+                ]}
+            ]
+
+            filters[cat_id] = filter_options
+
+        return filters
+
+    def homeVideoContent(self):
+        """
+        获取首页推荐视频内容，优先使用内存或磁盘上的缓存，过期后在后台刷新
+
+        Returns:
+            dict: 包含推荐视频列表的字典
+        """
+        import time
+
+        self._begin_call()
+        if self._home_videos is None:
+            videos, saved_at = self._load_disk_cache("home.json")
+            if videos:
+                self._home_videos = videos
+                self._home_cached_at = saved_at
+
+        if self._home_videos:
+            if time.time() - self._home_cached_at > self.HOME_CACHE_TTL:
+                self._revalidate("home", self._refresh_home_videos)
+            return {"list": self._home_videos}
+
+        return {"list": self._refresh_home_videos() or []}
+
+    def _refresh_home_videos(self):
+        """
+        获取首页推荐视频，更新内存缓存并写入磁盘
+
+        Returns:
+            list: 推荐视频列表，没有数据时返回空列表
+        """
+        import time
+
+        videos = self._fetch_home_videos()
+        if videos:
+            self._home_videos = videos
+            self._home_cached_at = time.time()
+            self._save_disk_cache("home.json", videos)
+        return videos
+
+    def _fetch_home_videos(self):
+        """
+        从本地片库或接口获取首页推荐视频
+
+        Returns:
+            list: 推荐视频列表
+        """
+        try:
+            # 本地片库可用时直接返回最近更新的视频
+            local_items = self._catalog_latest(30)
+            if local_items:
+                return self._build_video_list(local_items)
+
+            # 优先使用AJAX接口获取数据
+            ajax_data = self._request_ajax_data("0", "1", limit=30)
+            if ajax_data and "list" in ajax_data and ajax_data["list"]:
+                videos = self._build_video_list(ajax_data.get("list", []))
+                # 如果AJAX数据少于10条，尝试使用API接口补充
+                if len(videos) < 10:
+                    params = {"ac": "detail", "pg": "1"}
+                    api_data = self._request_data(params, list_view=True)
+                    if api_data and "list" in api_data and api_data["list"]:
+                        api_videos = self._build_video_list(api_data.get("list", []))
+                        # 优先使用API数据，因为数量可能更多
+                        if len(api_videos) > len(videos):
+                            return api_videos
+
+                return videos
+
+            # 如果AJAX接口没有返回数据，再尝试使用API接口
+            params = {
+                "ac": "detail",
+                "pg": "1"
+            }
+            data = self._request_data(params, list_view=True)
+            if not data:
+                return []
+
+            if "list" not in data or not data["list"]:
+                return []
+
+            return self._build_video_list(data.get("list", []))
+        except Exception as e:
+            return []
+
+    def categoryContent(self, tid, pg, filter, extend):
+        """
+        获取分类内容
+
+        Args:
+            tid (str): 分类ID
+            pg (str): 页码
+            filter (bool): 是否启用筛选
+            extend (dict): 扩展参数
+
+        Returns:
+            dict: 包含分类视频列表和分页信息的字典
+        """
+        self._begin_call()
+        try:
+            category_id = tid
+            if filter and extend and 'type_id' in extend and extend['type_id']:
+                category_id = extend['type_id']
+
+            # 没有其他筛选条件时优先使用本地片库，分页信息使用该分类最近一次从接口获取的结果
+            unfiltered = not (filter and extend and any(
+                value for key, value in extend.items() if key not in ('t', 'type_id')))
+            paging = self._catalog_paging(category_id) if unfiltered else None
+            if paging:
+                local_items = self._catalog_category(
+                    category_id, pg, paging["limit"])
+                if local_items:
+                    return {
+                        "list": self._build_video_list(local_items),
+                        "page": int(pg),
+                        "pagecount": max(paging["pagecount"], int(pg)),
+                        "limit": paging["limit"],
+                        "total": paging["total"]
+                    }
+
+            result = self._request_category(tid, category_id, pg, filter, extend)
+            if unfiltered and result.get("list"):
+                self._catalog_save_paging(category_id, result)
+            return result
+        except Exception as e:
+            # 如果所有方法都失败，尝试使用AJAX接口作为最后手段
+            try:
+                ajax_data = self._request_ajax_data(tid, pg)
+                if ajax_data:
+                    return self._process_ajax_response(ajax_data, pg)
+            except:
+                pass
+            return {"list": [], "page": 1, "pagecount": 1, "limit": 20, "total": 0}
+
+    def _request_category(self, tid, category_id, pg, filter, extend):
+        """
+        从接口获取分类内容，AJAX接口和API接口都没有数据时获取子分类数据
+
+        Args:
+            tid (str): 分类ID
+            category_id (str): 实际请求的分类ID，筛选了type_id时为筛选的分类
+            pg (str): 页码
+            filter (bool): 是否启用筛选
+            extend (dict): 扩展参数
+
+        Returns:
+            dict: 包含分类视频列表和分页信息的字典
+        """
+        if self.PARALLEL_CATEGORY_FETCH:
+            params = {"ac": "detail", "t": category_id, "pg": pg}
+            if filter and extend:
+                for key, value in extend.items():
+                    if key != 't' and key != 'type_id' and value:
+                        params[key] = value
+
+            result = self._race_category_requests(category_id, pg, params)
+            if result:
+                return result
+            # 两个接口都没有数据，再尝试获取子分类数据
+            return self._get_subcategory_data(tid, pg, extend if filter else {})
+
+        # 优先使用AJAX接口获取数据
+        ajax_data = self._request_ajax_data(category_id, pg)
+        if ajax_data:
+            # 如果AJAX数据少于10条，尝试使用API接口
+            if len(ajax_data.get("list", [])) < 10:
+                params = {"ac": "detail", "t": category_id, "pg": pg}
+                if filter and extend:
+                    for key, value in extend.items():
+                        if key != 't' and key != 'type_id' and value:
+                            params[key] = value
+
+                api_data = self._request_data(params, list_view=True)
+                if api_data and "list" in api_data and api_data["list"]:
+                    # 优先使用API数据
+                    videos = self._build_video_list(api_data.get("list", []))
+                    result = {
+                        "list": videos,
+                        "page": int(api_data.get("page", pg)),
+                        "pagecount": int(api_data.get("pagecount", 1)),
+                        "limit": int(api_data.get("limit", 20)),
+                        "total": int(api_data.get("total", 0))
+                    }
+                    return result
+            # 返回AJAX数据
+            return self._process_ajax_response(ajax_data, pg)
+
+        # 如果AJAX接口没有返回数据，再尝试使用API接口
+        params = {"ac": "detail", "t": category_id, "pg": pg}
+
+        if filter and extend:
+            for key, value in extend.items():
+                if key != 't' and key != 'type_id' and value:
+                    params[key] = value
+
+        data = self._request_data(params, list_view=True)
+        if not data:
+            # 如果API接口也没有数据，再尝试获取子分类数据
+            return self._get_subcategory_data(tid, pg, extend if filter else {})
+
+        if "list" not in data or not data["list"]:
+            # 如果API接口返回的数据没有列表，再尝试获取子分类数据
+            return self._get_subcategory_data(tid, pg, extend if filter else {})
+
+        videos = self._build_video_list(data.get("list", []))
+
+        result = {
+            "list": videos,
+            "page": int(data.get("page", pg)),
+            "pagecount": int(data.get("pagecount", 1)),
+            "limit": int(data.get("limit", 20)),
+            "total": int(data.get("total", 0))
+        }
+        return result
+
+    def _race_category_requests(self, category_id, pg, params):
+        """
+        同时请求AJAX接口和API接口，先返回可用数据的一方胜出，
+        AJAX数据少于10条时等待API结果并将两者合并
+
+        Args:
+            category_id (str): 分类ID
+            pg (str): 页码
+            params (dict): API接口请求参数
+
+        Returns:
+            dict or None: 成功时返回分类视频列表和分页信息，两个接口都没有数据时返回None
+        """
+        return self._run_async(self._race_category_requests_async(category_id, pg, params))
+
+    async def _race_category_requests_async(self, category_id, pg, params):
+        """
+        _race_category_requests的协程版本，两个请求在事件循环中并发执行
+
+        Args:
+            category_id (str): 分类ID
+            pg (str): 页码
+            params (dict): API接口请求参数
+
+        Returns:
+            dict or None: 成功时返回分类视频列表和分页信息，两个接口都没有数据时返回None
+        """
+        import asyncio
+
+        # 不等待落后的请求，胜出后立即返回，落后的请求继续执行并写入响应缓存
+        ajax_task = asyncio.ensure_future(
+            self._request_ajax_data_async(category_id, pg))
+        api_task = asyncio.ensure_future(
+            self._request_data_async(params, list_view=True))
+
+        ajax_data = None
+        api_data = None
+        pending = {ajax_task, api_task}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if ajax_task in done:
+                ajax_data = ajax_task.result()
+                if ajax_data and len(ajax_data.get("list", [])) >= 10:
+                    return self._process_ajax_response(ajax_data, pg)
+            if api_task in done:
+                api_data = api_task.result()
+                if api_data and api_data.get("list") and not ajax_task.done():
+                    return self._process_api_response(api_data, pg)
+
+        if api_data and api_data.get("list"):
+            result = self._process_api_response(api_data, pg)
+            # AJAX数据不足时，将AJAX中API没有的视频合并进来
+            if ajax_data and ajax_data.get("list"):
+                seen_ids = {video["vod_id"] for video in result["list"]}
+                result["list"].extend(
+                    video for video in self._process_ajax_response(ajax_data, pg)["list"]
+                    if video["vod_id"] not in seen_ids)
+            return result
+
+        if ajax_data:
+            return self._process_ajax_response(ajax_data, pg)
+        return None
+
+    def _process_api_response(self, data, pg):
+        """
+        处理API接口返回的列表数据
+
+        Args:
+            data (dict): API接口返回的数据
+            pg (str): 当前页码
+
+        Returns:
+            dict: 格式化后的结果
+        """
+        videos = self._build_video_list(data.get("list", []))
+
+        result = {
+            "list": videos,
+            "page": int(data.get("page", pg)),
+            "pagecount": int(data.get("pagecount", 1)),
+            "limit": int(data.get("limit", 20)),
+            "total": int(data.get("total", 0))
+        }
+        return result
+
+    def _process_ajax_response(self, ajax_data, pg):
+        """
+        处理AJAX接口返回的数据
+
+        Args:
+            ajax_data (dict): AJAX接口返回的数据
+            pg (str): 当前页码
+
+        Returns:
+            dict: 格式化后的结果
+        """
+        videos = [
+            self._build_video_object(item, True)
+            for item in ajax_data.get("list", [])
+        ]
+
+        result = {
+            "list": videos,
+            "page": int(ajax_data.get("page", pg)),
+            "pagecount": int(ajax_data.get("pagecount", 1)),
+            "limit": int(ajax_data.get("limit", 20)),
+            "total": int(ajax_data.get("total", 0))
+        }
+        return result
+
+    def _get_subcategory_data(self, tid, pg, extend):
+        """
+        获取子分类数据，当主分类下有子分类时使用此方法
+        按vod_time对各子分类的分页结果做多路归并，只拉取当前页所需的数据
+
+        Args:
+            tid (str): 主分类ID
+            pg (str): 页码
+            extend (dict): 扩展参数
+
+        Returns:
+            dict: 包含子分类视频列表和分页信息的字典
+        """
+        try:
+            _, sub_categories_map = self._fetch_categories()
+
+            if tid not in sub_categories_map:
+                return {"list": [], "page": 1, "pagecount": 1, "limit": 20, "total": 0}
+
+            limit = 20
+            page = max(1, int(pg))
+            end_idx = page * limit
+
+            state = self._get_subcategory_state(
+                tid, sub_categories_map[tid], extend)
+            with state["lock"]:
+                self._merge_subcategory_cursors(state, end_idx, extend)
+                paged_videos = state["merged"][end_idx - limit:end_idx]
+                total = max(sum(cursor["total"] for cursor in state["cursors"]),
+                            len(state["merged"]))
+
+            pagecount = (total + limit - 1) // limit
+
+            result = {
+                "list": paged_videos,
+                "page": page,
+                "pagecount": pagecount,
+                "limit": limit,
+                "total": total
+            }
+
+            return result
+        except Exception as e:
+            return {"list": [], "page": 1, "pagecount": 1, "limit": 20, "total": 0}
+
+    def _get_subcategory_state(self, tid, sub_categories, extend):
+        """
+        获取主分类的子分类归并状态，跨调用保留各子分类的游标，过期后重建
+
+        Args:
+            tid (str): 主分类ID
+            sub_categories (list): 子分类列表
+            extend (dict): 扩展参数
+
+        Returns:
+            dict: 归并状态，包含各子分类游标和已归并的视频列表
+        """
+        import time
+
+        key = (tid, tuple(sorted((str(k), str(v))
+               for k, v in (extend or {}).items() if v)))
+        with self._subcategory_states_lock:
+            state = self._subcategory_states.get(key)
+            if state is None or state["expires"] < time.time():
+                state = {
+                    "expires": time.time() + self.SUBCATEGORY_CURSOR_TTL,
+                    "lock": threading.Lock(),
+                    "merged": [],
+                    "cursors": [
+                        {"tid": sub_cat['v'], "next_pg": 1, "total": 0,
+                         "buffer": deque(), "exhausted": False}
+                        for sub_cat in sub_categories
+                    ]
+                }
+                self._subcategory_states[key] = state
+            self._subcategory_states.move_to_end(key)
+            while len(self._subcategory_states) > self.SUBCATEGORY_CURSOR_MAX:
+                self._subcategory_states.popitem(last=False)
+            return state
+
+    def _merge_subcategory_cursors(self, state, count, extend):
+        """
+        按vod_time从新到旧归并各子分类游标，直到已归并的视频数达到count或数据取完
+
+        Args:
+            state (dict): 归并状态
+            count (int): 需要归并的视频总数
+            extend (dict): 扩展参数
+        """
+        cursors = state["cursors"]
+        if len(state["merged"]) >= count:
+            return
+
+        # 缓冲区为空的游标（首次使用或上次请求失败）在事件循环中并发拉取下一页
+        pending = [cursor for cursor in cursors
+                   if not cursor["buffer"] and not cursor["exhausted"]]
+        if pending:
+            self._run_async(self._advance_subcategory_cursors(pending, extend))
+
+        while len(state["merged"]) < count:
+            # 有子分类未取完但拉取失败时无法确定下一条，停止归并，只返回已确定顺序的部分，下次调用再重试
+            if any(not cursor["buffer"] and not cursor["exhausted"] for cursor in cursors):
+                break
+            heads = [cursor for cursor in cursors if cursor["buffer"]]
+            if not heads:
+                break
+            cursor = max(heads, key=lambda c: c["buffer"][0].get('vod_time', ''))
+            state["merged"].append(
+                self._build_video_object(cursor["buffer"].popleft(), True))
+            # 游标数据用完时才拉取该子分类的下一页
+            if not cursor["buffer"]:
+                self._run_async(
+                    self._advance_subcategory_cursors([cursor], extend))
+
+    async def _advance_subcategory_cursors(self, cursors, extend):
+        """
+        并发拉取多个子分类游标的下一页数据
+
+        Args:
+            cursors (list): 子分类游标列表
+            extend (dict): 扩展参数
+        """
+        import asyncio
+
+        await asyncio.gather(*(self._advance_subcategory_cursor(cursor, extend)
+                               for cursor in cursors))
+
+    async def _advance_subcategory_cursor(self, cursor, extend):
+        """
+        拉取子分类游标的下一页数据到缓冲区，请求失败时保持游标不变以便下次重试
+
+        Args:
+            cursor (dict): 子分类游标
+            extend (dict): 扩展参数
+        """
+        while not cursor["buffer"] and not cursor["exhausted"]:
+            params = {"ac": "detail", "t": cursor["tid"],
+                      "pg": str(cursor["next_pg"])}
+            if extend:
+                for key, value in extend.items():
+                    if key != 't' and key != 'type_id' and value:
+                        params[key] = value
+
+            sub_data = await self._request_data_async(params, list_view=True)
+            if not sub_data:
+                return
+
+            # 缓冲区保存原始视频信息，归并时按vod_time排序后才构建列表字段
+            excluded = self._excluded_type_ids
+            cursor["buffer"].extend(
+                item for item in sub_data.get("list") or []
+                if self._normalize_type_id(item.get("type_id")) not in excluded)
+            cursor["total"] = int(sub_data.get("total", 0))
+            cursor["next_pg"] += 1
+            if not sub_data.get("list") or cursor["next_pg"] > int(sub_data.get("pagecount", 1)):
+                cursor["exhausted"] = True
+
+    def detailContent(self, ids):
+        """
+        获取视频详情
+
+        Args:
+            ids (list): 视频ID列表
+
+        Returns:
+            dict: 包含视频详细信息的字典
+        """
+        self._begin_call()
+        try:
+            if not ids:
+                return {"list": []}
+
+            # 本地片库中已有的视频不再请求接口
+            local_items = self._catalog_detail(ids)
+            missing_ids = [vod_id for vod_id in ids if str(vod_id) not in local_items]
+            items = list(local_items.values())
+            if missing_ids:
+                items.extend(self._fetch_detail_items(missing_ids))
+
+            if not items:
+                return {"list": []}
+            # 合并本地和各批次的接口数据后按请求的ID顺序返回
+            order = {str(vod_id): index for index, vod_id in enumerate(ids)}
+            items.sort(key=lambda item: order.get(
+                str(item.get("vod_id")), len(order)))
+
+            details = []
+            for item in items:
+                if self._normalize_type_id(item.get("type_id")) in self._excluded_type_ids:
+                    continue
+
+                detail = self._build_video_object(item)
+
+                play_from = item.get("vod_play_from", "")
+                play_url = item.get("vod_play_url", "")
+
+                filtered_play_from, filtered_play_url = self._filter_play_sources(
+                    play_from, play_url)
+
+                detail.update({
+                    "vod_play_from": filtered_play_from,
+                    "vod_play_url": filtered_play_url
+                })
+                details.append(detail)
+
+            result = {"list": details}
+            return result
+        except Exception as e:
+            return {"list": []}
+
+    def _fetch_detail_items(self, ids):
+        """
+        请求视频详情，合并窗口内各调用方的视频ID，一次ids请求最多DETAIL_BATCH_MAX个，
+        已在请求中的视频ID直接等待该请求的结果
+
+        Args:
+            ids (list): 视频ID列表
+
+        Returns:
+            list: 接口返回的原始视频信息，按请求的ID顺序排列，未返回的ID忽略
+        """
+        ids = [str(vod_id) for vod_id in ids]
+        batches = []
+        led_batches = []
+        with self._detail_lock:
+            for vod_id in ids:
+                batch = self._detail_inflight.get(vod_id)
+                if batch is None:
+                    batch = self._detail_batch
+                    if batch is None:
+                        # 当前没有收集中的批次，由本调用方发起请求
+                        batch = {"ids": [], "items": {}, "full": threading.Event(),
+                                 "done": threading.Event()}
+                        self._detail_batch = batch
+                        led_batches.append(batch)
+                    batch["ids"].append(vod_id)
+                    self._detail_inflight[vod_id] = batch
+                    if len(batch["ids"]) >= self.DETAIL_BATCH_MAX:
+                        self._detail_batch = None
+                        batch["full"].set()
+                if batch not in batches:
+                    batches.append(batch)
+
+        # 除最后一个批次外，本调用方发起的批次已经装满，直接在事件循环中并发请求
+        for batch in led_batches[:-1]:
+            self._submit_async(self._request_detail_batch(batch))
+        if led_batches:
+            self._run_detail_batch(led_batches[-1])
+
+        items = {}
+        for batch in batches:
+            if batch["done"].wait(self.DETAIL_BATCH_TIMEOUT):
+                items.update(batch["items"])
+        return [items[vod_id] for vod_id in ids if vod_id in items]
+
+    def _run_detail_batch(self, batch):
+        """
+        等待合并窗口结束或批次装满后请求详情，并唤醒等待该批次的调用方
+
+        Args:
+            batch (dict): 详情批次
+        """
+        batch["full"].wait(self.DETAIL_BATCH_WINDOW)
+        self._run_async(self._request_detail_batch(batch))
+
+    async def _request_detail_batch(self, batch):
+        """
+        结束批次的收集并在事件循环中请求详情，完成后唤醒等待该批次的调用方
+
+        Args:
+            batch (dict): 详情批次
+        """
+        with self._detail_lock:
+            if self._detail_batch is batch:
+                self._detail_batch = None
+            ids = list(batch["ids"])
+
+        try:
+            data = await self._request_data_async({"ac": "detail", "ids": ','.join(ids)})
+            for item in (data or {}).get("list") or []:
+                if "vod_id" in item:
+                    batch["items"][str(item["vod_id"])] = item
+        finally:
+            with self._detail_lock:
+                for vod_id in ids:
+                    if self._detail_inflight.get(vod_id) is batch:
+                        del self._detail_inflight[vod_id]
+            batch["done"].set()
+
+    def searchContent(self, key, quick, pg="1"):
+        """
+        搜索视频内容
+
+        Args:
+            key (str): 搜索关键词
+            quick (bool): 是否快速搜索
+            pg (str): 页码，默认为"1"
+
+        Returns:
+            dict: 包含搜索结果和分页信息的字典
+        """
+        self._begin_call()
+        if quick:
+            result = self._quick_search_result(key, pg)
+            if result is not None:
+                return result
+        return self._search_request(key, pg)
+
+    def _quick_search_result(self, key, pg):
+        """
+        快速搜索优先使用本地片名索引，命中时在后台请求接口补充索引
+
+        Args:
+            key (str): 搜索关键词
+            pg (str): 页码
+
+        Returns:
+            dict or None: 片名索引中的搜索结果，不是第一页或没有命中时返回None
+        """
+        if str(pg) != "1":
+            return None
+        videos = self._search_title_index(key, self.TITLE_INDEX_QUICK_LIMIT)
+        if not videos:
+            return None
+        self._refresh_quick_search(key)
+        return {"list": videos, "page": 1, "pagecount": 1,
+                "limit": len(videos), "total": len(videos)}
+
+    def _search_request(self, key, pg="1", timeout=10, retries=3):
+        """
+        请求本站的搜索接口
+
+        Args:
+            key (str): 搜索关键词
+            pg (str): 页码
+            timeout (int): 请求超时时间（秒）
+            retries (int): 重试次数
+
+        Returns:
+            dict: 包含搜索结果和分页信息的字典
+        """
+        try:
+            params = {"ac": "detail", "wd": key, "pg": pg}
+            data = self._request_data(
+                params, timeout=timeout, retries=retries, list_view=True)
+            return self._process_search_response(data, pg)
+        except Exception as e:
+            return {"list": [], "page": 1, "pagecount": 1, "limit": 20, "total": 0}
+
+    async def _search_request_async(self, key, pg="1", timeout=10, retries=3):
+        """
+        _search_request的协程版本
+
+        Args:
+            key (str): 搜索关键词
+            pg (str): 页码
+            timeout (int): 请求超时时间（秒）
+            retries (int): 重试次数
+
+        Returns:
+            dict: 包含搜索结果和分页信息的字典
+        """
+        try:
+            params = {"ac": "detail", "wd": key, "pg": pg}
+            data = await self._request_data_async(
+                params, timeout=timeout, retries=retries, list_view=True)
+            return self._process_search_response(data, pg)
+        except Exception as e:
+            return {"list": [], "page": 1, "pagecount": 1, "limit": 20, "total": 0}
+
+    def _process_search_response(self, data, pg):
+        """
+        处理搜索接口返回的数据
+
+        Args:
+            data (dict or None): 搜索接口返回的数据
+            pg (str): 当前页码
+
+        Returns:
+            dict: 格式化后的结果
+        """
+        if not data:
+            return {"list": [], "page": 1, "pagecount": 1, "limit": 20, "total": 0}
+
+        if "list" not in data or not data["list"]:
+            return {
+                "list": [],
+                "page": int(data.get("page", pg)),
+                "pagecount": int(data.get("pagecount", 0)),
+                "limit": int(data.get("limit", 20)),
+                "total": int(data.get("total", 0))
+            }
+
+        videos = self._build_video_list(data.get("list", []))
+
+        result = {
+            "list": videos,
+            "page": int(data.get("page", pg)),
+            "pagecount": int(data.get("pagecount", 1)),
+            "limit": int(data.get("limit", 20)),
+            "total": int(data.get("total", 0))
+        }
+        return result
+
+    def _refresh_quick_search(self, key):
+        """
+        在后台请求搜索接口，结果经_build_video_object进入片名索引，同一关键词同时只刷新一次
+
+        Args:
+            key (str): 搜索关键词
+        """
+        with self._title_index_lock:
+            if key in self._quick_refreshing:
+                return
+            self._quick_refreshing.add(key)
+
+        def refresh():
+            try:
+                self._search_request(key, "1", retries=1)
+                self._flush_title_index()
+            finally:
+                with self._title_index_lock:
+                    self._quick_refreshing.discard(key)
+
+        self._submit_shared(refresh)
+
+    def _title_initials(self, text):
+        """
+        计算文本的拼音首字母，字母和数字原样保留，不在GB2312一级汉字中的字符忽略
+
+        Args:
+            text (str): 规范化后的片名
+
+        Returns:
+            str: 拼音首字母串
+        """
+        import bisect
+
+        cache = VodSpider._pinyin_initial_cache
+        initials = []
+        for char in text:
+            initial = cache.get(char)
+            if initial is None:
+                initial = char if char < '\x80' else ''
+                try:
+                    encoded = char.encode('gb2312')
+                except UnicodeEncodeError:
+                    encoded = b''
+                if len(encoded) == 2:
+                    index = bisect.bisect_right(
+                        self._PINYIN_INITIAL_BOUNDARIES, (encoded[0] << 8) | encoded[1]) - 1
+                    if 0 <= index < len(self._PINYIN_INITIALS):
+                        initial = self._PINYIN_INITIALS[index]
+                cache[char] = initial
+            initials.append(initial)
+        return ''.join(initials)
+
+    def _title_grams(self, normalized, initials):
+        """
+        生成规范化片名和拼音首字母的相邻两字，作为倒排表的键
+
+        Args:
+            normalized (str): 规范化片名
+            initials (str): 拼音首字母
+
+        Returns:
+            set: 相邻两字的集合
+        """
+        grams = {normalized[i:i + 2] for i in range(len(normalized) - 1)}
+        grams.update(initials[i:i + 2] for i in range(len(initials) - 1))
+        return grams
+
+    def _index_title_grams(self, vod_id, normalized, initials):
+        """
+        将视频加入倒排表，调用方需持有_title_index_lock
+
+        Args:
+            vod_id (str): 视频ID
+            normalized (str): 规范化片名
+            initials (str): 拼音首字母
+        """
+        postings = self._title_postings
+        for gram in self._title_grams(normalized, initials):
+            ids = postings.get(gram)
+            if ids is None:
+                postings[gram] = [vod_id]
+            else:
+                ids.append(vod_id)
+
+    def _add_title_doc(self, vod_id, name, pic, remarks):
+        """
+        将视频加入片名索引，调用方需持有_title_index_lock
+
+        Args:
+            vod_id (str): 视频ID
+            name (str): 片名
+            pic (str): 图片地址
+            remarks (str): 备注
+        """
+        doc = self._title_docs.pop(vod_id, None)
+        if doc is not None and doc[0] == name:
+            doc[1] = pic
+            doc[2] = remarks
+        else:
+            normalized = ''.join(
+                char for char in str(name).lower() if char.isalnum())
+            initials = self._title_initials(normalized)
+            doc = [name, pic, remarks, normalized, initials]
+            # 片名变化时旧片名的倒排项保留，检索时按当前片名校验
+            self._index_title_grams(vod_id, normalized, initials)
+        self._title_docs[vod_id] = doc
+        self._title_index_dirty = True
+
+    def _rebuild_title_postings(self):
+        """
+        按当前收录的视频重建倒排表，调用方需持有_title_index_lock
+        """
+        self._title_postings = {}
+        for vod_id, doc in self._title_docs.items():
+            self._index_title_grams(vod_id, doc[3], doc[4])
+
+    def _flush_title_index(self):
+        """
+        将待处理的视频加入片名索引，首次调用时从磁盘加载索引，必要时在后台保存
+        """
+        import time
+
+        with self._title_index_lock:
+            if not self._title_index_loaded:
+                self._title_index_loaded = True
+                self._load_title_index()
+
+            pending, self._title_pending = self._title_pending, []
+            self._title_flush_scheduled = False
+            for vod_id, name, pic, remarks in pending:
+                if name:
+                    self._add_title_doc(vod_id, name, pic, remarks)
+
+            # 超过上限时淘汰最早收录的视频，保留九成
+            if len(self._title_docs) > self.TITLE_INDEX_MAX_DOCS:
+                keep = self.TITLE_INDEX_MAX_DOCS * 9 // 10
+                while len(self._title_docs) > keep:
+                    self._title_docs.popitem(last=False)
+                self._rebuild_title_postings()
+
+            save = (self._title_index_dirty and
+                    time.time() - self._title_index_saved_at > self.TITLE_INDEX_SAVE_INTERVAL)
+            if save:
+                self._title_index_saved_at = time.time()
+
+        if save:
+            self._submit_shared(self._save_title_index)
+
+    def _search_title_index(self, key, limit):
+        """
+        在本地片名索引中检索，支持片名子串和拼音首字母
+
+        Args:
+            key (str): 搜索关键词
+            limit (int): 最大结果数
+
+        Returns:
+            list: 视频信息列表，完全匹配和前缀匹配的片名排在前面
+        """
+        query = ''.join(char for char in str(key).lower() if char.isalnum())
+        if not query:
+            return []
+
+        self._flush_title_index()
+        with self._title_index_lock:
+            docs = self._title_docs
+            if len(query) == 1:
+                # 单字检索直接遍历
+                vod_ids = docs
+            else:
+                # 取最短的倒排项作为候选，再逐个校验
+                postings = self._title_postings
+                candidates = [postings.get(query[i:i + 2])
+                              for i in range(len(query) - 1)]
+                if not all(candidates):
+                    return []
+                vod_ids = set(min(candidates, key=len))
+
+            matches = []
+            for vod_id in vod_ids:
+                doc = docs.get(vod_id)
+                if doc is None:
+                    continue
+                normalized, initials = doc[3], doc[4]
+                if query in normalized:
+                    rank = 0 if normalized == query else (
+                        1 if normalized.startswith(query) else 2)
+                elif query in initials:
+                    rank = 0 if initials == query else (
+                        1 if initials.startswith(query) else 2)
+                else:
+                    continue
+                matches.append((rank, len(normalized), vod_id, doc))
+
+        matches.sort(key=lambda match: match[:3])
+        return [
+            {"vod_id": vod_id, "vod_name": doc[0],
+                "vod_pic": doc[1], "vod_remarks": doc[2]}
+            for _, _, vod_id, doc in matches[:limit]
+        ]
+
+    def _site_cache_path(self, name):
+        """
+        获取本站的本地缓存文件路径，按接口地址区分站点
+
+        Args:
+            name (str): 缓存文件名，会在扩展名前加上站点标识
+
+        Returns:
+            str: 缓存文件路径
+        """
+        import hashlib
+
+        digest = hashlib.md5(self.API_URL.encode('utf-8')).hexdigest()[:16]
+        stem, dot, suffix = name.partition('.')
+        return os.path.join(self.CACHE_DIR, f"{stem}_{digest}{dot}{suffix}")
+
+    def _title_index_path(self):
+        """
+        获取本站片名索引文件路径
+
+        Returns:
+            str: 索引文件路径
+        """
+        return self._site_cache_path("title_index.tsv.gz")
+
+    def _load_title_index(self):
+        """
+        从磁盘加载片名索引，调用方需持有_title_index_lock
+        文件为gzip压缩的制表符分隔文本，每行为视频ID、片名、图片、备注
+        """
+        import gzip
+
+        path = self._title_index_path()
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    fields = line.rstrip('\n').split('\t')
+                    if len(fields) == 4 and fields[1]:
+                        self._add_title_doc(*fields)
+        except FileNotFoundError:
+            return
+        except (OSError, EOFError, UnicodeDecodeError) as e:
+            self.log(f"读取片名索引失败: {path}, {e}")
+        self._title_index_dirty = False
+
+    def _save_title_index(self):
+        """
+        将片名索引写入磁盘，先写临时文件再替换，避免写入中断导致文件损坏
+        """
+        import gzip
+
+        with self._title_index_lock:
+            if not self._title_index_dirty:
+                return
+            self._title_index_dirty = False
+            rows = [
+                '\t'.join(str(field).replace('\t', ' ').replace('\n', ' ')
+                          for field in (vod_id, doc[0], doc[1], doc[2]))
+                for vod_id, doc in self._title_docs.items()
+            ]
+
+        path = self._title_index_path()
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.CACHE_DIR, exist_ok=True)
+            with gzip.open(temp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+                for row in rows:
+                    f.write(row)
+                    f.write('\n')
+            os.replace(temp_path, path)
+        except OSError as e:
+            self.log(f"保存片名索引失败: {path}, {e}")
+
+    def _catalog_path(self):
+        """
+        获取本站本地片库文件路径
+
+        Returns:
+            str: SQLite数据库文件路径
+        """
+        return self._site_cache_path("catalog.db")
+
+    def _open_catalog(self):
+        """
+        打开本地片库，首次使用时建表，调用方需持有_catalog_lock
+
+        Returns:
+            sqlite3.Connection: 数据库连接
+        """
+        import sqlite3
+
+        if self._catalog is None:
+            os.makedirs(self.CACHE_DIR, exist_ok=True)
+            catalog = sqlite3.connect(
+                self._catalog_path(), check_same_thread=False)
+            catalog.execute(
+                "CREATE TABLE IF NOT EXISTS vod (vod_id TEXT PRIMARY KEY, type_id TEXT, vod_time TEXT, item TEXT)")
+            catalog.execute(
+                "CREATE INDEX IF NOT EXISTS vod_type_time ON vod (type_id, vod_time)")
+            catalog.execute(
+                "CREATE INDEX IF NOT EXISTS vod_time ON vod (vod_time)")
+            catalog.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            catalog.commit()
+            self._catalog = catalog
+        return self._catalog
+
+    def _close_catalog(self):
+        """
+        停止后台同步并关闭本地片库
+        """
+        if self._catalog_stop is not None:
+            self._catalog_stop.set()
+            self._catalog_stop = None
+        with self._catalog_lock:
+            if self._catalog is not None:
+                self._catalog.close()
+                self._catalog = None
+
+    def _start_catalog_sync(self):
+        """
+        启动后台同步线程，立即同步一次，之后每隔CATALOG_SYNC_INTERVAL秒同步一次
+        """
+        if self._catalog_stop is not None:
+            return
+        stop = threading.Event()
+        self._catalog_stop = stop
+
+        def run():
+            while not stop.is_set():
+                try:
+                    self._sync_catalog()
+                except Exception as e:
+                    self.log(f"本地片库同步失败: {e}")
+                stop.wait(self.CATALOG_SYNC_INTERVAL)
+
+        threading.Thread(target=run, name="catalog-sync", daemon=True).start()
+
+    def _catalog_state(self):
+        """
+        读取同步状态，调用方需持有_catalog_lock
+
+        Returns:
+            tuple: (上次完整同步的时间戳, 本地片库完整覆盖的最早更新时间)，未同步过时为(0, None)
+        """
+        rows = dict(self._open_catalog().execute(
+            "SELECT key, value FROM meta WHERE key IN ('synced_at', 'covered_since')"))
+        return float(rows.get("synced_at", 0)), rows.get("covered_since")
+
+    def _sync_catalog(self):
+        """
+        按h参数拉取上次同步之后更新的视频并写入本地片库
+        接口按更新时间倒序分页，已拉取的前几页完整覆盖了其中最早的更新时间之后的所有视频
+
+        Returns:
+            int: 本次写入的视频数量
+        """
+        import math
+        import time
+
+        with self._catalog_lock:
+            synced_at, covered_since = self._catalog_state()
+
+        started = time.time()
+        if synced_at:
+            hours = math.ceil((started - synced_at) / 3600) + 1
+        else:
+            hours = self.CATALOG_SYNC_INITIAL_HOURS
+
+        count = 0
+        oldest = None
+        complete = False
+        pg = 1
+        while pg <= self.CATALOG_SYNC_MAX_PAGES:
+            if self._catalog_stop is not None and self._catalog_stop.is_set():
+                break
+            data = self._request_data(
+                {"ac": "detail", "h": str(hours), "pg": str(pg)})
+            if not data:
+                break
+            items = data.get("list") or []
+            rows = [
+                (str(item["vod_id"]), self._normalize_type_id(item.get("type_id")),
+                 item.get("vod_time", ""), json.dumps(item, ensure_ascii=False))
+                for item in items if "vod_id" in item
+            ]
+            if rows:
+                page_oldest = min(row[2] for row in rows)
+                oldest = page_oldest if oldest is None else min(oldest, page_oldest)
+                with self._catalog_lock:
+                    catalog = self._open_catalog()
+                    catalog.executemany(
+                        "INSERT OR REPLACE INTO vod VALUES (?, ?, ?, ?)", rows)
+                    catalog.commit()
+                count += len(rows)
+            if not items or pg >= int(data.get("pagecount", 1)):
+                complete = True
+                break
+            pg += 1
+
+        with self._catalog_lock:
+            catalog = self._open_catalog()
+            if complete:
+                # 与上次同步衔接，完整覆盖的范围保持不变
+                if not covered_since and oldest:
+                    covered_since = oldest
+                meta = {"synced_at": str(started)}
+                if covered_since:
+                    meta["covered_since"] = covered_since
+            elif oldest:
+                # 没有拉完时只有已拉取的部分是完整的，下次同步仍从上次完整同步的时间开始
+                meta = {"covered_since": oldest}
+            else:
+                meta = {}
+            catalog.executemany(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)", meta.items())
+            catalog.commit()
+
+        self.log(f"本地片库同步完成: {count}个视频, h={hours}, 完整={complete}")
+        return count
+
+    def _catalog_query(self, sql, args):
+        """
+        在本地片库可用时执行查询，片库未同步或同步已过期时不使用
+
+        Args:
+            sql (str): 查询语句，查询两列，第二列为视频信息JSON
+            args (tuple): 查询参数
+
+        Returns:
+            tuple or None: ([(第一列, 原始视频信息)], 完整覆盖的最早更新时间)，不可用时返回None
+        """
+        import time
+
+        if not self.CATALOG_SYNC_ENABLED:
+            return None
+        with self._catalog_lock:
+            try:
+                synced_at, covered_since = self._catalog_state()
+                if not covered_since or time.time() - synced_at > self.CATALOG_SYNC_INTERVAL * 2:
+                    return None
+                rows = self._open_catalog().execute(sql, args).fetchall()
+            except Exception as e:
+                self.log(f"读取本地片库失败: {e}")
+                return None
+        return [(row[0], json.loads(row[1])) for row in rows], covered_since
+
+    def _catalog_latest(self, limit):
+        """
+        从本地片库获取最近更新的视频
+
+        Args:
+            limit (int): 视频数量
+
+        Returns:
+            list or None: 原始视频信息列表，本地片库不可用或数量不足时返回None
+        """
+        result = self._catalog_query(
+            "SELECT vod_time, item FROM vod ORDER BY vod_time DESC LIMIT ?", (limit,))
+        if not result:
+            return None
+        rows, covered_since = result
+        if len(rows) < limit or rows[-1][0] < covered_since:
+            return None
+        return [item for _, item in rows]
+
+    def _catalog_category(self, type_id, pg, limit=20):
+        """
+        从本地片库获取分类的一页视频，只有整页都在完整覆盖范围内时才使用
+
+        Args:
+            type_id (str): 分类ID
+            pg (str): 页码
+            limit (int): 每页数量
+
+        Returns:
+            list or None: 原始视频信息列表，本地数据不完整时返回None
+        """
+        try:
+            offset = (int(pg) - 1) * limit
+        except (TypeError, ValueError):
+            return None
+        result = self._catalog_query(
+            "SELECT vod_time, item FROM vod WHERE type_id = ? ORDER BY vod_time DESC LIMIT ? OFFSET ?",
+            (self._normalize_type_id(type_id), limit, offset))
+        if not result:
+            return None
+        rows, covered_since = result
+        if len(rows) < limit or rows[-1][0] < covered_since:
+            return None
+        return [item for _, item in rows]
+
+    def _catalog_paging(self, type_id):
+        """
+        读取分类最近一次从接口获取的分页信息
+
+        Args:
+            type_id (str): 分类ID
+
+        Returns:
+            dict or None: 包含total、pagecount、limit，本地片库未启用或没有记录时返回None
+        """
+        if not self.CATALOG_SYNC_ENABLED:
+            return None
+        with self._catalog_lock:
+            try:
+                row = self._open_catalog().execute(
+                    "SELECT value FROM meta WHERE key = ?",
+                    (f"paging:{self._normalize_type_id(type_id)}",)).fetchone()
+            except Exception as e:
+                self.log(f"读取本地片库失败: {e}")
+                return None
+        return json.loads(row[0]) if row else None
+
+    def _catalog_save_paging(self, type_id, result):
+        """
+        记录分类从接口获取的分页信息，本地片库返回该分类时使用同样的分页信息
+
+        Args:
+            type_id (str): 分类ID
+            result (dict): 接口返回的分类内容
+        """
+        if not self.CATALOG_SYNC_ENABLED:
+            return
+        paging = {
+            "total": int(result.get("total", 0)),
+            "pagecount": int(result.get("pagecount", 1)),
+            "limit": int(result.get("limit", 20)) or 20
+        }
+        with self._catalog_lock:
+            try:
+                catalog = self._open_catalog()
+                catalog.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                                (f"paging:{self._normalize_type_id(type_id)}", json.dumps(paging)))
+                catalog.commit()
+            except Exception as e:
+                self.log(f"写入本地片库失败: {e}")
+
+    def _catalog_detail(self, ids):
+        """
+        从本地片库获取视频详情
+
+        Args:
+            ids (list): 视频ID列表
+
+        Returns:
+            dict: 视频ID到原始视频信息的映射，只包含本地已有的视频
+        """
+        ids = [str(vod_id) for vod_id in ids]
+        result = self._catalog_query(
+            f"SELECT vod_id, item FROM vod WHERE vod_id IN ({','.join('?' * len(ids))})", ids)
+        if not result:
+            return {}
+        return dict(result[0])
+
+    def aggregateSearch(self, key, quick=False, pg="1", sites=None, deadline=None):
+        """
+        同时搜索本站和站点注册表中的所有站点，按站点返回的先后顺序逐个产出结果
+
+        Args:
+            key (str): 搜索关键词
+            quick (bool): 是否快速搜索
+            pg (str): 页码，默认为"1"
+            sites (list): 要搜索的站点key列表，默认为注册表中的全部站点
+            deadline (float): 总时限（秒），默认为SEARCH_DEADLINE
+
+        Yields:
+            dict: 单个站点的搜索结果，包含site、name、elapsed以及searchContent返回的字段
+        """
+        import concurrent.futures
+        import time
+
+        started = time.time()
+        deadline = self.SEARCH_DEADLINE if deadline is None else deadline
+        self._begin_call(deadline)
+
+        # 本站在前，注册表中接口地址或镜像有重叠的站点是同一个后端，只搜索一次
+        spiders = [("", self)]
+        api_urls = set(self._api_endpoints(self.API_URL, self.API_MIRRORS))
+        for site_key in (self._site_keys() if sites is None else sites):
+            spider = self._get_site_spider(site_key)
+            if spider is None:
+                continue
+            endpoints = set(self._api_endpoints(spider.API_URL, spider.API_MIRRORS))
+            if endpoints & api_urls:
+                continue
+            api_urls |= endpoints
+            spiders.append((site_key, spider))
+
+        timeout = min(self.SEARCH_SITE_TIMEOUT, deadline)
+        futures = {}
+        # 各站点的搜索在事件循环中并发执行
+        for site_key, spider in spiders:
+            future = self._submit_async(
+                self._timed_search(spider, key, quick, pg, timeout))
+            futures[future] = (site_key, spider)
+
+        try:
+            for future in concurrent.futures.as_completed(
+                    futures, timeout=max(0, deadline - (time.time() - started))):
+                site_key, spider = futures[future]
+                result, elapsed = future.result()
+                result.update(
+                    {"site": site_key, "name": spider.getName(), "elapsed": elapsed})
+                yield result
+        except concurrent.futures.TimeoutError:
+            for future, (site_key, spider) in futures.items():
+                if not future.done():
+                    future.cancel()
+                    self._record_search_metrics(spider.getName(), None)
+                    self.log(f"聚合搜索超时: {spider.getName()}")
+
+    async def _timed_search(self, spider, key, quick, pg, timeout):
+        """
+        在事件循环中执行单个站点的搜索并记录耗时，快速搜索时先查该站点的片名索引
+
+        Args:
+            spider (VodSpider): 站点爬虫
+            key (str): 搜索关键词
+            quick (bool): 是否快速搜索
+            pg (str): 页码
+            timeout (int): 请求超时时间（秒）
+
+        Returns:
+            tuple: (搜索结果, 耗时秒数)
+        """
+        import time
+
+        started = time.time()
+        result = None
+        if quick:
+            # 片名索引首次使用时要从磁盘加载，放到线程池中执行
+            result = await self._to_thread(spider._quick_search_result, key, pg)
+        if result is None:
+            result = await spider._search_request_async(key, pg, timeout=timeout, retries=1)
+        elapsed = time.time() - started
+        self._record_search_metrics(spider.getName(), elapsed)
+        return result, elapsed
+
+    def _record_search_metrics(self, name, elapsed):
+        """
+        记录站点的搜索耗时
+
+        Args:
+            name (str): 站点名称
+            elapsed (float or None): 耗时秒数，超时放弃时为None
+        """
+        with VodSpider._shared_lock:
+            metrics = VodSpider._search_metrics.setdefault(
+                name, {"count": 0, "timeouts": 0, "last": None, "avg": None})
+            if elapsed is None:
+                metrics["timeouts"] += 1
+                return
+            metrics["count"] += 1
+            metrics["last"] = elapsed
+            # 指数移动平均，近期耗时权重更高
+            if metrics["avg"] is None:
+                metrics["avg"] = elapsed
+            else:
+                metrics["avg"] = metrics["avg"] * 0.8 + elapsed * 0.2
+
+    def _search_stats(self):
+        """
+        获取聚合搜索各站点的耗时统计
+
+        Returns:
+            dict: 站点名称到搜索次数、超时次数、最近耗时和平均耗时的映射
+        """
+        with VodSpider._shared_lock:
+            return {name: dict(metrics) for name, metrics in VodSpider._search_metrics.items()}
+
+    def playerContent(self, flag, id, vipFlags):
+        """
+        获取播放地址
+
+        Args:
+            flag (str): 播放来源标识
+            id (str): 视频ID
+            vipFlags (list): VIP标识列表
+
+        Returns:
+            dict: 包含播放地址和相关参数的字典
+        """
+        proxy_url = self.getProxyUrl() + f"&url={self.b64encode(id)}"
+        return {'url': proxy_url, 'header': self.DEFAULT_HEADERS, 'parse': 0, 'jx': 0}
+
+    def destroy(self):
+        """
+        销毁爬虫实例，释放资源
+        """
+        self._cancel_proxy_requests()
+        with self._segment_lock:
+            self._segment_buffer.clear()
+            if self._segment_executor is not None:
+                self._segment_executor.shutdown(wait=False)
+                self._segment_executor = None
+        if self._title_pending:
+            self._flush_title_index()
+        self._save_title_index()
+        self._close_catalog()
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _filter_play_sources(self, play_from, play_url):
+        """
+        过滤播放源，移除不需要的播放源
+
+        Args:
+            play_from (str): 播放源字符串，使用"$$$"分隔
+            play_url (str): 播放地址字符串，使用"$$$"分隔
+
+        Returns:
+            tuple: (filtered_play_from, filtered_play_url) 过滤后的播放源和播放地址
+        """
+        if not play_from or not play_url:
+            return play_from, play_url
+
+        from_list = play_from.split("$$$")
+        url_list = play_url.split("$$$")
+
+        filtered_pairs = [
+            (source, url_list[i])
+            for i, source in enumerate(from_list)
+            if i < len(url_list) and not any(keyword in source.lower() for keyword in self.FILTER_KEYWORDS)
+        ]
+
+        if not filtered_pairs:
+            return play_from, play_url
+
+        filtered_from_list, filtered_url_list = zip(
+            *filtered_pairs) if filtered_pairs else ([], [])
+        return "$$$".join(filtered_from_list), "$$$".join(filtered_url_list)
+
+    def b64encode(self, data):
+        """
+        base64编码
+
+        Args:
+            data (str): 需要编码的字符串
+
+        Returns:
+            str: base64编码后的字符串
+        """
+        import base64
+        return base64.b64encode(data.encode('utf-8')).decode('utf-8')
+
+    def b64decode(self, data):
+        """
+        base64解码
+
+        Args:
+            data (str): 需要解码的字符串
+
+        Returns:
+            str: base64解码后的字符串
+        """
+        import base64
+        return base64.b64decode(data.encode('utf-8')).decode('utf-8')
+
+    def _parse_playlist(self, data, url, rule=None):
+        """
+        解析M3U8内容为紧凑的片段表，只记录原始缓冲区中的字节偏移，不复制行内容
+
+        Args:
+            data (bytes): M3U8原始内容
+            url (str): 原始M3U8 URL
+            rule (tuple): _playlist_rule返回的api.json规则，匹配到的内容在输出时一并删除
+
+        Returns:
+            dict: 解析后的播放列表
+                - buffer: 原始内容
+                - base_url/current_path: 补全.ts地址用的前缀，已转义为正则替换模板
+                - discontinuity_starts/discontinuity_ends: 每个#EXT-X-DISCONTINUITY行的起始偏移和下一行的起始偏移
+                - sequence_starts/sequence_ends: 不连续点之间各片段从第一个EXTINF行到片段结尾的字节范围
+                - sequence_counts: 各片段的分片数量
+                - rule_ranges: api.json规则匹配到的[start, end)字节范围
+        """
+        from array import array
+        from urllib import parse
+
+        parsed_url = parse.urlparse(url)
+        base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+        current_path = url.rsplit('/', maxsplit=1)[0] + '/'
+
+        size = len(data)
+        discontinuity_starts = array('l')
+        discontinuity_ends = array('l')
+        for match in self._DISCONTINUITY_PATTERN.finditer(data):
+            discontinuity_starts.append(match.start())
+            discontinuity_ends.append(min(match.end() + 1, size))
+
+        # 最后一个不连续点之后的片段到#EXT-X-ENDLIST为止
+        tail_start = discontinuity_ends[-1] if discontinuity_ends else 0
+        tail_end = data.find(b'#EXT-X-ENDLIST', tail_start)
+        tail_end = size if tail_end == -1 else data.rfind(b'\n', 0, tail_end) + 1
+
+        sequence_starts = array('l')
+        sequence_ends = array('l')
+        sequence_counts = array('l')
+        region_start = 0
+        region_bounds = list(zip(discontinuity_starts, discontinuity_ends))
+        region_bounds.append((tail_end, size))
+        for region_end, next_start in region_bounds:
+            count = data.count(b'#EXTINF:', region_start, region_end)
+            if count:
+                first = data.find(b'#EXTINF:', region_start, region_end)
+                sequence_starts.append(data.rfind(b'\n', 0, first) + 1)
+                sequence_ends.append(region_end)
+                sequence_counts.append(count)
+            region_start = next_start
+
+        rule_ranges = []
+        if rule is not None:
+            rule_ranges = [match.span() for match in rule[1].finditer(data)]
+            if rule_ranges:
+                self.log(f"应用规则{rule[0]}，匹配{len(rule_ranges)}处")
+
+        return {
+            "buffer": data,
+            "base_url": base_url.encode('utf-8').replace(b'\\', b'\\\\'),
+            "current_path": current_path.encode('utf-8').replace(b'\\', b'\\\\'),
+            "discontinuity_starts": discontinuity_starts,
+            "discontinuity_ends": discontinuity_ends,
+            "sequence_starts": sequence_starts,
+            "sequence_ends": sequence_ends,
+            "sequence_counts": sequence_counts,
+            "rule_ranges": rule_ranges
+        }
+
+    def _sequence_durations(self, playlist, index):
+        """
+        解析片段中每个分片的时长，只在需要比对时调用
+
+        Args:
+            playlist (dict): _parse_playlist返回的播放列表
+            index (int): 片段序号
+
+        Returns:
+            list: 各分片的时长（秒）
+        """
+        view = memoryview(playlist["buffer"])
+        durations = []
+        for value in self._EXTINF_PATTERN.findall(
+                view[playlist["sequence_starts"][index]:playlist["sequence_ends"][index]]):
+            try:
+                durations.append(float(value))
+            except ValueError:
+                durations.append(0)
+        return durations
+
+    def _playlist_text(self, playlist, start, end):
+        """
+        获取播放列表指定字节范围的文本，主要用于日志输出
+
+        Args:
+            playlist (dict): _parse_playlist返回的播放列表
+            start (int): 起始偏移
+            end (int): 结束偏移
+
+        Returns:
+            str: 对应范围的文本
+        """
+        return playlist["buffer"][start:end].decode('utf-8', errors='replace')
+
+    def _write_playlist(self, playlist, ranges, timing=None):
+        """
+        删除指定字节范围和api.json规则匹配的范围，保留的部分直接从原始缓冲区切片输出，输出时补全.ts地址
+
+        Args:
+            playlist (dict): _parse_playlist返回的播放列表
+            ranges (list): 需要删除的[start, end)字节范围列表
+            timing (dict): 耗时统计，记录删除的分片数量和时长
+
+        Returns:
+            bytes: 输出的M3U8内容
+        """
+        data = playlist["buffer"]
+        view = memoryview(data)
+        parts = []
+
+        # 合并重叠的区间，避免重复统计
+        merged = []
+        for start, end in sorted(list(ranges) + playlist["rule_ranges"]):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        ranges = merged
+
+        if timing is not None:
+            stripped_segments = 0
+            stripped_seconds = 0.0
+            for start, end in ranges:
+                for value in self._EXTINF_PATTERN.findall(view[start:end]):
+                    stripped_segments += 1
+                    try:
+                        stripped_seconds += float(value)
+                    except ValueError:
+                        pass
+            timing["stripped_segments"] = stripped_segments
+            timing["stripped_seconds"] = round(stripped_seconds, 3)
+            if stripped_segments:
+                self.log(
+                    f"过滤广告{stripped_segments}个分片，共{stripped_seconds:.2f}秒")
+
+        def write(start, end):
+            # 相对于根路径和相对于当前路径的.ts地址分别补全，没有以/开头的行时跳过第一次替换
+            chunk = view[start:end]
+            if data.startswith(b'/', start, end) or data.find(b'\n/', start, end) != -1:
+                chunk = self._ROOT_SEGMENT_PATTERN.sub(
+                    playlist["base_url"], chunk)
+            parts.append(self._RELATIVE_SEGMENT_PATTERN.sub(
+                playlist["current_path"], chunk))
+
+        # 一次遍历写入保留的部分
+        position = 0
+        for start, end in ranges:
+            if start > position:
+                write(position, start)
+            position = end
+        if position < len(data):
+            write(position, len(data))
+        return parts[0] if len(parts) == 1 else b''.join(parts)
+
+    def _filter_ads_by_discontinuity_original(self, playlist, timing=None):
+        """
+        根据不连续点过滤广告，使用与非凡资源.py相同的逻辑
+
+        Args:
+            playlist (dict): _parse_playlist返回的播放列表
+            timing (dict): 耗时统计
+
+        Returns:
+            bytes: 过滤后的内容
+        """
+        starts = playlist["discontinuity_starts"]
+        ends = playlist["discontinuity_ends"]
+
+        # 根据不连续点确定需要过滤的范围
+        filter_ranges = []
+        if len(starts) >= 1:
+            filter_ranges.append((starts[0], ends[0]))
+        if len(starts) >= 3:
+            filter_ranges.append((starts[1], ends[2]))
+        if len(starts) >= 5:
+            filter_ranges.append((starts[3], ends[4]))
+
+        # 过滤掉指定范围内的内容
+        return self._write_playlist(playlist, filter_ranges, timing)
+
+    def _ad_signature_index(self, host):
+        """
+        编译适用于某个CDN主机的广告时长特征索引，结果按主机和误差缓存
+        特征按(分片数量, 总时长所在区间)分桶，区间宽度为分片数量乘以误差，
+        每个特征登记到总时长误差范围覆盖的所有区间，查询时只需计算一次总时长即可定位候选特征
+
+        Args:
+            host (str): 播放列表所在主机名
+
+        Returns:
+            dict: buckets为分桶后的特征，counts为所有特征的分片数量
+        """
+        import math
+
+        tolerance = max(0.0, float(self.AD_SIGNATURE_TOLERANCE))
+        key = (host, tolerance)
+        index = self._ad_signature_indexes.get(key)
+        if index is not None:
+            return index
+
+        buckets = {}
+        counts = set()
+        for suffix, signatures in self.AD_SIGNATURES.items():
+            if suffix and host != suffix and not host.endswith('.' + suffix):
+                continue
+            for signature in signatures:
+                durations = tuple(float(duration) for duration in signature)
+                count = len(durations)
+                if not count:
+                    continue
+                step = self._ad_signature_step(count, tolerance)
+                total = sum(durations)
+                for cell in range(math.floor((total - count * tolerance) / step),
+                                  math.floor((total + count * tolerance) / step) + 1):
+                    bucket = buckets.setdefault((count, cell), [])
+                    if durations not in bucket:
+                        bucket.append(durations)
+                counts.add(count)
+
+        index = {"buckets": buckets, "counts": frozenset(counts)}
+        self._ad_signature_indexes[key] = index
+        return index
+
+    def _ad_signature_step(self, count, tolerance):
+        """
+        计算特征分桶的总时长区间宽度
+
+        Args:
+            count (int): 分片数量
+            tolerance (float): 每个分片允许的时长误差（秒）
+
+        Returns:
+            float: 区间宽度（秒），误差为0时按1毫秒计算
+        """
+        return max(count * tolerance, 0.001)
+
+    def _filter_ads_by_duration(self, playlist, index, timing=None):
+        """
+        使用时长片段模式过滤广告（模式2）
+
+        Args:
+            playlist (dict): _parse_playlist返回的播放列表
+            index (dict): _ad_signature_index返回的广告时长特征索引
+            timing (dict): 耗时统计
+
+        Returns:
+            bytes: 过滤广告后的M3U8内容
+        """
+        import math
+
+        tolerance = max(0.0, float(self.AD_SIGNATURE_TOLERANCE))
+        buckets = index["buckets"]
+        counts = index["counts"]
+
+        # 找到匹配特征的广告片段，只解析分片数量与某个特征一致的片段时长
+        ad_ranges = []
+        for sequence, count in enumerate(playlist["sequence_counts"]):
+            if count not in counts:
+                continue
+            durations = self._sequence_durations(playlist, sequence)
+            cell = math.floor(
+                sum(durations) / self._ad_signature_step(count, tolerance))
+            for signature in buckets.get((count, cell), ()):
+                if all(abs(d - p) <= tolerance for d, p in zip(durations, signature)):
+                    ad_ranges.append(
+                        (playlist["sequence_starts"][sequence], playlist["sequence_ends"][sequence]))
+                    break
+
+        # 打印确定需要过滤的区间
+        if self.LOG_AD_RANGES:
+            if ad_ranges:
+                self.log(f"模式2检测到广告区间: {ad_ranges}")
+                for start, end in ad_ranges:
+                    self.log(f"过滤区间 [{start}, {end}):")
+                    for line in self._playlist_text(playlist, start, end).splitlines():
+                        self.log(f"  {line}")
+            else:
+                self.log("模式2未检测到广告区间")
+
+        # 过滤广告片段
+        return self._write_playlist(playlist, ad_ranges, timing)
+
+    def _fetch_playlist(self, url, cancel_event=None, timing=None, headers=None):
+        """
+        下载M3U8播放列表，限制超时时间和大小，下载过程中可取消
+
+        Args:
+            url (str): M3U8播放地址
+            cancel_event (threading.Event): 取消标记，被设置时中止下载
+            timing (dict): 耗时统计，累加下载耗时和字节数
+            headers (dict): 附加请求头，如条件请求的If-None-Match
+
+        Returns:
+            tuple: (status_code, data, response_headers)
+                - 200时data为播放列表原始内容，其他状态码时data为None
+                - 请求失败、超限或被取消时status_code为None
+        """
+        import time
+
+        start = time.time()
+        size = 0
+        request_headers = dict(self.DEFAULT_HEADERS, **(headers or {}))
+        try:
+            response = self._session_get(
+                url, headers=request_headers, timeout=self.PLAYLIST_TIMEOUT, stream=True)
+            try:
+                if response.status_code != 200:
+                    return response.status_code, None, response.headers
+
+                chunks = []
+                for chunk in response.iter_content(chunk_size=65536):
+                    if cancel_event is not None and cancel_event.is_set():
+                        self.log(f"播放列表下载已取消: {url}")
+                        return None, None, {}
+                    size += len(chunk)
+                    if size > self.PLAYLIST_MAX_BYTES:
+                        self.log(f"播放列表超过{self.PLAYLIST_MAX_BYTES}字节: {url}")
+                        return None, None, {}
+                    chunks.append(chunk)
+                return 200, b''.join(chunks), response.headers
+            finally:
+                response.close()
+        except Exception as e:
+            self.log(f"播放列表下载失败: {url} {e}")
+            return None, None, {}
+        finally:
+            if timing is not None:
+                timing["fetch"] = timing.get("fetch", 0) + time.time() - start
+                timing["bytes"] = timing.get("bytes", 0) + size
+
+    def _playlist_cache_lookup(self, url):
+        """
+        查询已过滤播放列表缓存
+
+        Args:
+            url (str): M3U8播放地址
+
+        Returns:
+            tuple: (entry, fresh) 缓存条目（不存在时为None）和是否仍在有效期内
+        """
+        import time
+        with self._playlist_cache_lock:
+            entry = self._playlist_cache.get(url)
+            if entry is None:
+                return None, False
+            self._playlist_cache.move_to_end(url)
+            return entry, entry["expires"] >= time.time()
+
+    def _playlist_cache_store(self, url, content, response_headers):
+        """
+        写入已过滤播放列表缓存，保存ETag/Last-Modified用于过期后的条件请求
+
+        Args:
+            url (str): M3U8播放地址
+            content (str): 过滤广告后的播放列表内容
+            response_headers (dict): 原始响应头
+        """
+        import time
+        size = len(content)
+        if size > self.PLAYLIST_CACHE_MAX_BYTES:
+            return
+        with self._playlist_cache_lock:
+            old = self._playlist_cache.pop(url, None)
+            if old is not None:
+                self._playlist_cache_bytes -= old["size"]
+            self._playlist_cache[url] = {
+                "expires": time.time() + self.PLAYLIST_CACHE_TTL,
+                "etag": response_headers.get("ETag"),
+                "last_modified": response_headers.get("Last-Modified"),
+                "content": content,
+                "size": size
+            }
+            self._playlist_cache_bytes += size
+            while (len(self._playlist_cache) > self.PLAYLIST_CACHE_MAX_ENTRIES
+                   or self._playlist_cache_bytes > self.PLAYLIST_CACHE_MAX_BYTES):
+                _, evicted = self._playlist_cache.popitem(last=False)
+                self._playlist_cache_bytes -= evicted["size"]
+
+    def _playlist_cache_refresh(self, url):
+        """
+        条件请求返回304后延长缓存有效期
+
+        Args:
+            url (str): M3U8播放地址
+        """
+        import time
+        with self._playlist_cache_lock:
+            entry = self._playlist_cache.get(url)
+            if entry is not None:
+                entry["expires"] = time.time() + self.PLAYLIST_CACHE_TTL
+
+    def _cancel_proxy_requests(self):
+        """
+        取消所有正在进行的本地代理请求
+        """
+        with self._proxy_lock:
+            for cancel_event in self._proxy_cancel_events:
+                cancel_event.set()
+
+    def _proxy_stats(self):
+        """
+        获取最近的本地代理耗时记录
+
+        Returns:
+            list: 每次代理请求的URL、总耗时、下载耗时、字节数和跳转层数
+        """
+        with self._proxy_lock:
+            return list(self._proxy_timings)
+
+    def del_ads(self, url, depth=0, cancel_event=None, timing=None):
+        """
+        去广告逻辑，解析M3U8播放列表并过滤广告片段
+
+        Args:
+            url (str): M3U8播放地址
+            depth (int): 当前主播放列表跳转层数
+            cancel_event (threading.Event): 取消标记
+            timing (dict): 耗时统计
+
+        Returns:
+            bytes: 过滤广告后的播放内容，出错时返回空内容
+        """
+        if depth > self.PLAYLIST_MAX_DEPTH:
+            self.log(f"播放列表跳转超过{self.PLAYLIST_MAX_DEPTH}层: {url}")
+            return b''
+        if timing is not None:
+            timing["depth"] = depth
+
+        entry, fresh = self._playlist_cache_lookup(url)
+        if fresh:
+            if timing is not None:
+                timing["cache"] = "hit"
+            return entry["content"]
+
+        # 缓存过期时带上校验信息发起条件请求
+        conditional_headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                conditional_headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                conditional_headers["If-Modified-Since"] = entry["last_modified"]
+
+        status_code, data, response_headers = self._fetch_playlist(
+            url, cancel_event, timing, conditional_headers)
+        if status_code == 304 and entry is not None:
+            self._playlist_cache_refresh(url)
+            if timing is not None:
+                timing["cache"] = "revalidated"
+            return entry["content"]
+        if status_code != 200:
+            return b''
+
+        if timing is not None:
+            timing["cache"] = "miss"
+        content = self._filter_playlist(
+            url, data, depth, cancel_event, timing)
+        if content:
+            self._playlist_cache_store(url, content, response_headers)
+        return content
+
+    def _filter_playlist(self, url, data, depth, cancel_event=None, timing=None):
+        """
+        解析M3U8播放列表内容，主播放列表跳转到子播放列表，媒体播放列表过滤广告
+
+        Args:
+            url (str): M3U8播放地址
+            data (bytes): 播放列表原始内容
+            depth (int): 当前主播放列表跳转层数
+            cancel_event (threading.Event): 取消标记
+            timing (dict): 耗时统计
+
+        Returns:
+            bytes: 过滤广告后的播放内容，不是M3U8格式时返回空内容
+        """
+        from urllib import parse
+
+        # 检查是否是M3U8格式，并且是否有混合内容
+        if data.startswith(b'#EXTM3U') and data[7:8] in (b'', b'\r', b'\n'):
+            # 循环查找是否有包含m3u8后缀的行，媒体播放列表通常不含该后缀，直接跳过逐行检查
+            next_url = None
+            if b'.m3u8' in data:
+                for line in data.splitlines():
+                    line = line.strip()
+                    if line and not line.startswith(b'#') and line.endswith(b'.m3u8'):
+                        next_url = line.decode('utf-8', errors='replace')
+                        break
+
+            if next_url:
+                # 解析当前URL的协议和域名部分
+                parsed_url = parse.urlparse(url)
+                base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+                # 确定新的URL
+                if next_url.startswith('http'):  # 完整URL
+                    new_url = next_url
+                elif next_url.startswith('/'):  # 相对于根路径
+                    new_url = base_url + next_url
+                else:  # 相对于当前路径
+                    current_path = url.rsplit('/', maxsplit=1)[0] + '/'
+                    new_url = current_path + next_url
+
+                # 递归处理
+                return self.del_ads(new_url, depth + 1, cancel_event, timing)
+            else:
+                # 解析片段表，检查#EXT-X-DISCONTINUITY标签的数量
+                playlist = self._parse_playlist(
+                    data, url, self._playlist_rule(url))
+                discontinuity_count = len(playlist["discontinuity_starts"])
+
+                if discontinuity_count < 10:
+                    self.log("使用模式1处理")
+                    # 模式1: 直接使用非凡资源.py的处理方式
+                    return self._filter_ads_by_discontinuity_original(playlist, timing)
+                else:
+                    self.log("使用模式2处理")
+                    # 模式2: 根据AD_SIGNATURES中的广告时长特征判断广告
+                    index = self._ad_signature_index(parse.urlparse(url).hostname or "")
+                    return self._filter_ads_by_duration(playlist, index, timing)
+
+        # 不是M3U8格式时返回空内容
+        self.log(f"不是M3U8播放列表: {url}")
+        return b''
+
+    def localProxy(self, params):
+        """
+        本地代理方法，用于处理播放地址的去广告
+
+        Args:
+            params (dict): 代理参数
+
+        Returns:
+            list: 代理响应结果
+        """
+        import time
+
+        url = self.b64decode(params.get('url', ''))
+        if params.get('type') == 'ts':
+            return self._serve_segment(url)
+
+        cancel_event = threading.Event()
+        timing = {"url": url}
+        with self._proxy_lock:
+            self._proxy_cancel_events.add(cancel_event)
+        start = time.time()
+        try:
+            content = self.del_ads(url, cancel_event=cancel_event, timing=timing)
+        finally:
+            timing["total"] = time.time() - start
+            with self._proxy_lock:
+                self._proxy_cancel_events.discard(cancel_event)
+                self._proxy_timings.append(timing)
+
+        if self.SEGMENT_PROXY_ENABLED and content:
+            content = self._proxy_segments(url, content)
+        return [200, 'application/vnd.apple.mpegurl', content]
+
+    def _proxy_segments(self, url, content):
+        """
+        将播放列表中的分片地址改写为本地代理地址，并记录分片顺序用于预取
+
+        Args:
+            url (str): 播放列表地址
+            content (bytes): 过滤广告后的播放列表
+
+        Returns:
+            bytes: 改写后的播放列表
+        """
+        from urllib import parse
+
+        segments = []
+        proxy_prefix = self.getProxyUrl() + "&type=ts&url="
+
+        def replace(match):
+            segment_url = match.group(0).decode('utf-8', 'replace')
+            segments.append(segment_url)
+            return (proxy_prefix + parse.quote(self.b64encode(segment_url))).encode('utf-8')
+
+        content = self._ABSOLUTE_SEGMENT_PATTERN.sub(replace, content)
+
+        with self._segment_lock:
+            playlists = self._segment_playlists
+            playlists.pop(url, None)
+            playlists[url] = segments
+            while len(playlists) > self.SEGMENT_PLAYLIST_MAX:
+                playlists.popitem(last=False)
+            # 按保留的播放列表重建分片位置
+            self._segment_positions = {
+                segment_url: (playlist_segments, index)
+                for playlist_segments in playlists.values()
+                for index, segment_url in enumerate(playlist_segments)
+            }
+        return content
+
+    def _serve_segment(self, url):
+        """
+        返回分片内容，优先使用已预取的数据，同时预取后续分片
+
+        Args:
+            url (str): 分片地址
+
+        Returns:
+            list: 代理响应结果
+        """
+        future = self._segment_future(url)
+        with self._segment_lock:
+            position = self._segment_positions.get(url)
+        if position is not None:
+            segments, index = position
+            for next_url in segments[index + 1:index + 1 + self.SEGMENT_PREFETCH_COUNT]:
+                self._segment_future(next_url)
+
+        try:
+            result = future.result(timeout=sum(self.PLAYLIST_TIMEOUT) * 2)
+        except Exception as e:
+            self.log(f"分片下载失败: {url}, {e}")
+            result = None
+        finally:
+            # 已经交给播放器的分片不再保留
+            with self._segment_lock:
+                if self._segment_buffer.get(url) is future:
+                    del self._segment_buffer[url]
+
+        if result is None:
+            return [502, 'text/plain', b'']
+        content_type, data = result
+        return [200, content_type, data]
+
+    def _segment_future(self, url):
+        """
+        获取分片的下载任务，没有时提交到分片线程池，缓冲区超过上限时淘汰最早的已完成分片
+
+        Args:
+            url (str): 分片地址
+
+        Returns:
+            concurrent.futures.Future: 下载任务，结果为(Content-Type, 内容)或None
+        """
+        import concurrent.futures
+
+        with self._segment_lock:
+            future = self._segment_buffer.get(url)
+            if future is not None:
+                return future
+            if self._segment_executor is None:
+                self._segment_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.SEGMENT_PREFETCH_COUNT + 1, thread_name_prefix="segment")
+            future = self._segment_executor.submit(self._fetch_segment, url)
+            self._segment_buffer[url] = future
+
+            # 下载失败的分片不保留，下次请求时重新下载
+            total = 0
+            for buffered_url, buffered in list(self._segment_buffer.items()):
+                if not buffered.done():
+                    continue
+                if buffered.exception() is not None or buffered.result() is None:
+                    del self._segment_buffer[buffered_url]
+                else:
+                    total += len(buffered.result()[1])
+            while total > self.SEGMENT_BUFFER_MAX_BYTES and len(self._segment_buffer) > 1:
+                oldest_url, oldest = next(iter(self._segment_buffer.items()))
+                if not oldest.done():
+                    break
+                del self._segment_buffer[oldest_url]
+                total -= len(oldest.result()[1])
+        return future
+
+    def _fetch_segment(self, url):
+        """
+        下载分片
+
+        Args:
+            url (str): 分片地址
+
+        Returns:
+            tuple or None: (Content-Type, 内容)，失败或超过SEGMENT_MAX_BYTES时返回None
+        """
+        import requests
+
+        try:
+            response = self._session_get(
+                url, headers=self.DEFAULT_HEADERS, timeout=self.PLAYLIST_TIMEOUT, stream=True)
+            try:
+                if response.status_code != 200:
+                    return None
+                chunks = []
+                size = 0
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    size += len(chunk)
+                    if size > self.SEGMENT_MAX_BYTES:
+                        return None
+                    chunks.append(chunk)
+                return response.headers.get('Content-Type', 'video/mp2t'), b''.join(chunks)
+            finally:
+                response.close()
+        except requests.RequestException as e:
+            self.log(f"分片下载失败: {url}, {e}")
+            return None
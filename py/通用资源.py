@@ -0,0 +1,16 @@
+# coding=utf-8
+"""
+通用资源站爬虫
+不声明站点配置，由init的extend指定站点：JSON格式的站点配置、api.json中sites的key，或key@api.json的路径或http(s)地址
+爬取逻辑由vod_base.VodSpider提供
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from vod_base import VodSpider
+
+
+class Spider(VodSpider):
+    """
+    通用资源站爬虫
+    """